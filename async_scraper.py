@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Async eBay Price Scraper using Playwright
+Drives many search pages concurrently from one event loop and browser.
+"""
+
+import asyncio
+import sys
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+from scraper import EbayScraper
+
+
+class AsyncEbayScraper:
+    """Async eBay scraper that checks many search terms concurrently."""
+
+    def __init__(self, headless=True, region='UK', concurrency=4, block_resources=None, resource_policy=None,
+                 verify='top1', verify_k=3, verify_tabs=4, base_url=None, **filters):
+        """
+        Initialize the scraper.
+
+        Args:
+            headless (bool): Whether to run browser in headless mode (default: True)
+            region (str): eBay region to search (default: 'UK')
+            concurrency (int): Maximum number of pages driven at the same time (default: 4)
+            block_resources (bool): Abort images, fonts, media and tracker requests
+                (default: True when headless, False otherwise)
+            resource_policy (ResourcePolicy): What to block when blocking is on (default: ResourcePolicy())
+            verify (str): 'none', 'top1' or 'topK', as for EbayScraper (default: 'top1')
+            verify_k (int): Number of listings confirmed by verify='topK' (default: 3)
+            verify_tabs (int): Maximum product pages loaded at the same time per term (default: 4)
+            base_url (str): Site to scrape instead of the region's eBay domain, as for EbayScraper
+                (default: None)
+            **filters: Server-side search filters, as for EbayScraper (items_per_page,
+                buy_it_now, condition, location)
+        """
+        # The sync scraper supplies region settings, URLs and price parsing
+        self.helper = EbayScraper(
+            headless=headless,
+            region=region,
+            direct_search=True,
+            block_resources=block_resources,
+            resource_policy=resource_policy,
+            verify=verify,
+            verify_k=verify_k,
+            verify_tabs=verify_tabs,
+            base_url=base_url,
+            **filters
+        )
+        self.headless = headless
+        self.region = region
+        self.ebay_url = self.helper.ebay_url
+        self.concurrency = concurrency
+        self.semaphore = None
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.warm = {'consent': False, 'location': False}
+
+    async def start(self):
+        """Start the browser and create the shared context."""
+        print(f"🚀 Launching browser (up to {self.concurrency} concurrent pages)...")
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(headless=self.headless)
+        self.context = await self.browser.new_context(**self.helper.context_options())
+        if self.helper.resource_policy:
+            await self.context.route('**/*', self.handle_route)
+        # Consent and delivery location already in the saved state are skipped for every page
+        self.warm = self.helper.saved_warm_state()
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        print(f"✅ Browser launched successfully (Location: {self.region})\n")
+
+    async def close(self):
+        """Close the browser and cleanup resources."""
+        if self.context:
+            try:
+                print("💾 Saving cookies for next session...")
+                EbayScraper.write_storage_state(await self.context.storage_state(), self.helper.cookies_file)
+            except Exception as e:
+                print(f"⚠️  Could not save cookies: {str(e)}")
+
+        if self.browser:
+            print("\n🔒 Closing browser...")
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+
+    async def handle_route(self, route):
+        """Route handler for context.route(): abort blocked requests, continue the rest."""
+        request = route.request
+        if self.helper.resource_policy.should_block(request.url, request.resource_type):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def handle_cookie_consent(self, page):
+        """Handle cookie consent popup if it appears, once for the shared context."""
+        if self.warm['consent']:
+            return
+
+        for selector in EbayScraper.COOKIE_SELECTORS:
+            try:
+                if await page.locator(selector).is_visible(timeout=2000):
+                    print("🍪 Accepting cookie consent...")
+                    await page.click(selector, timeout=2000)
+                    break
+            except Exception:
+                continue
+        self.warm['consent'] = True
+
+    async def search_product(self, page, search_term):
+        """
+        Open the price-sorted search results for a product.
+
+        Args:
+            page: Page to navigate
+            search_term (str): The product to search for
+
+        Returns:
+            bool: True if listings were found, False otherwise
+        """
+        try:
+            search_url = self.helper.build_search_url(search_term)
+            print(f"🔍 [{search_term}] Navigating to {search_url}...")
+            await page.goto(search_url, timeout=30000)
+            await self.handle_cookie_consent(page)
+
+            # Set delivery location; localStorage is shared by every page of the context
+            if not self.warm['location']:
+                postcode = EbayScraper.REGION_POSTCODES.get(self.region, EbayScraper.REGION_POSTCODES['UK'])
+                await page.evaluate(
+                    "([postcode, country]) => {"
+                    " localStorage.setItem('ebay_postcode', postcode);"
+                    " localStorage.setItem('ebay_country', country); }",
+                    [postcode, self.region]
+                )
+                self.warm['location'] = True
+
+            # Wait for listings or the no-results banner, then check for the banner first, as
+            # EbayScraper._verify_search_results() does: the "fewer words" cards under it
+            # don't match the search
+            await page.wait_for_selector(f'{EbayScraper.LISTING_SELECTOR}, .srp-save-null-search', timeout=10000)
+            if await EbayScraper.combined_locator(page, EbayScraper.NO_RESULTS_SELECTORS).count():
+                print(f"❌ [{search_term}] No results found")
+                return False
+
+            await page.wait_for_selector(EbayScraper.LISTING_SELECTOR, state='attached', timeout=10000)
+            return True
+
+        except PlaywrightTimeoutError:
+            print(f"❌ [{search_term}] No product listings found (timeout)")
+            return False
+        except Exception as e:
+            print(f"❌ [{search_term}] Error during search: {str(e)}")
+            return False
+
+    async def extract_listings(self, page):
+        """
+        Read every result card on a search results page in one in-page pass.
+
+        Args:
+            page: Page showing search results
+
+        Returns:
+            list: Listing dicts, as returned by EbayScraper.extract_listings()
+        """
+        listings = await page.evaluate(EbayScraper.EXTRACT_LISTINGS_JS, EbayScraper.LISTING_FIELD_SELECTORS)
+        return self.helper.normalize_listings(listings)
+
+    async def read_product_price(self, url):
+        """
+        Load a product page in a new tab and extract its price.
+
+        Args:
+            url (str): Product page URL
+
+        Returns:
+            dict: {'price', 'price_text', 'url'}; 'price' is None if no price was found
+        """
+        tab = await self.context.new_page()
+        try:
+            await tab.goto(url, timeout=30000)
+
+            # Wait once for whichever price element shows up first
+            try:
+                await EbayScraper.combined_locator(tab, EbayScraper.PRICE_SELECTORS).first.wait_for(
+                    state='visible', timeout=3000
+                )
+            except PlaywrightTimeoutError:
+                return {'price': None, 'price_text': None, 'url': tab.url}
+
+            for selector in EbayScraper.PRICE_SELECTORS:
+                try:
+                    price_elem = EbayScraper.visible_locator(tab, selector).first
+                    if not await price_elem.is_visible():
+                        continue
+                    price_text = (await price_elem.text_content()).strip()
+                    price = self.helper.clean_price(price_text)
+                    if price:
+                        return {'price': price, 'price_text': price_text, 'url': tab.url}
+                except Exception:
+                    continue
+
+            return {'price': None, 'price_text': None, 'url': tab.url}
+
+        finally:
+            await tab.close()
+
+    async def read_product_prices(self, urls):
+        """
+        Read several product pages concurrently, at most verify_tabs tabs at a time.
+
+        Args:
+            urls (list): Product page URLs
+
+        Returns:
+            list: One {'price', 'price_text', 'url'} dict per URL, in the same order
+        """
+        tabs = asyncio.Semaphore(self.helper.verify_tabs)
+
+        async def read(url):
+            async with tabs:
+                return await self.read_product_price(url)
+
+        return await asyncio.gather(*(read(url) for url in urls))
+
+    async def extract_lowest_price(self, page, search_term, store_name=None):
+        """
+        Extract the lowest price and optionally a specific store's price.
+
+        Args:
+            page: Page showing the sorted search results
+            search_term (str): The product that was searched for (for log output)
+            store_name (str or iterable): Optional store name, or several, to find
+
+        Returns:
+            dict: Lowest price info and optional store price, or None if extraction failed
+        """
+        try:
+            listings = await self.extract_listings(page)
+            if not listings:
+                print(f"❌ [{search_term}] Could not find any listings with a product link")
+                return None
+
+            plan = self.helper.plan_price_check(listings, store_name)
+            details = []
+            if plan['detail_urls']:
+                # Fetch the candidates and the store's item side by side
+                details = await self.read_product_prices(plan['detail_urls'])
+            return self.helper.build_price_result(plan, details)
+
+        except PlaywrightTimeoutError:
+            print(f"❌ [{search_term}] Timeout while extracting prices")
+            return None
+        except Exception as e:
+            print(f"❌ [{search_term}] Error during price extraction: {str(e)}")
+            return None
+
+    async def scrape(self, search_term, store_name=None):
+        """
+        Scrape one search term on its own page, within the concurrency limit.
+
+        Args:
+            search_term (str): The product to search for
+            store_name (str or iterable): Optional store name, or several, to find your listings
+
+        Returns:
+            dict: Product information or None if scraping failed
+        """
+        async with self.semaphore:
+            page = await self.context.new_page()
+            try:
+                if not await self.search_product(page, search_term):
+                    return None
+                return await self.extract_lowest_price(page, search_term, store_name=store_name)
+            finally:
+                await page.close()
+
+    async def scrape_many(self, search_terms, store_name=None):
+        """
+        Scrape several search terms concurrently.
+
+        Args:
+            search_terms (list): Products to search for
+            store_name (str or iterable): Optional store name(s) to find in every search
+
+        Returns:
+            list: One result (or None) per search term, in input order
+        """
+        await self.start()
+        try:
+            return await asyncio.gather(
+                *(self.scrape(term, store_name=store_name) for term in search_terms)
+            )
+        finally:
+            await self.close()
+
+    def run(self, search_terms, store_name=None):
+        """
+        Run scrape_many() from synchronous code.
+
+        Args:
+            search_terms (list): Products to search for
+            store_name (str or iterable): Optional store name(s) to find in every search
+
+        Returns:
+            list: One result (or None) per search term, in input order
+        """
+        return asyncio.run(self.scrape_many(search_terms, store_name=store_name))
+
+
+def main():
+    """Scrape every search term given on the command line concurrently."""
+    search_terms = sys.argv[1:]
+    if not search_terms:
+        print("Usage: python async_scraper.py \"term one\" \"term two\" ...")
+        sys.exit(1)
+
+    results = AsyncEbayScraper(headless=True).run(search_terms)
+
+    print()
+    print("=" * 60)
+    for term, result in zip(search_terms, results):
+        if result:
+            print(f"✅ {term}: {result['lowest']['price']} - {result['lowest']['url']}")
+        else:
+            print(f"❌ {term}: Could not find product information")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
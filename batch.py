@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Batch mode for the eBay Price Scraper
+Checks a whole list of search terms in one run through a single warm browser.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext
+
+from browser_pool import BrowserPool
+from http_backend import HttpBackend
+from metrics import ScraperMetrics
+from price_history import PriceHistory
+from scraper import EbayScraper
+from selector_order import SelectorOrder, DEFAULT_ORDER_FILE
+from selector_stats import SelectorStats
+from timing import TimingLog
+
+
+# Columns written when the output file is a CSV
+CSV_FIELDS = [
+    'term', 'region', 'store', 'status',
+    'lowest_title', 'lowest_price', 'lowest_url',
+    'store_title', 'store_price', 'store_url',
+    'error', 'elapsed_s',
+]
+
+
+def read_terms(path, default_region='UK'):
+    """
+    Read batch rows from a CSV or JSONL file.
+
+    CSV files need a header with a ``term`` column and may add ``store`` and ``region``
+    columns. JSONL files hold one object per line with the same keys. Several stores can
+    be given as a list (JSONL) or separated by ``|``.
+
+    Args:
+        path (str): Path to the input file (.csv or .jsonl)
+        default_region (str): Region used for rows that don't name one (default: 'UK')
+
+    Yields:
+        dict: Row with 'term', 'store' (a name, a list of names, or None) and 'region'
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.csv'):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+
+        for row in rows:
+            term = (row.get('term') or '').strip()
+            if not term:
+                continue
+
+            region = (row.get('region') or default_region).strip().upper()
+            if region not in EbayScraper.EBAY_REGIONS:
+                print(f"⚠️  Unknown region '{region}' for \"{term}\", using {default_region} instead")
+                region = default_region
+
+            store = row.get('store') or ''
+            if isinstance(store, str):
+                store = [name.strip() for name in store.split('|') if name.strip()]
+            store = [name for name in store if name]
+
+            yield {
+                'term': term,
+                'store': store[0] if len(store) == 1 else (store or None),
+                'region': region,
+            }
+
+
+class ResultWriter:
+    """Streams one record per search term to a JSONL or CSV file."""
+
+    def __init__(self, path):
+        """
+        Initialize the writer.
+
+        Args:
+            path (str): Output file path; a .csv extension writes CSV, anything else JSONL
+        """
+        self.path = path
+        self.is_csv = path.lower().endswith('.csv')
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.csv_writer = None
+        if self.is_csv:
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=CSV_FIELDS, extrasaction='ignore')
+            self.csv_writer.writeheader()
+
+    def write(self, record):
+        """
+        Write one record and flush it to disk.
+
+        Args:
+            record (dict): Result record from build_record()
+        """
+        if self.is_csv:
+            row = {
+                'term': record['term'],
+                'region': record['region'],
+                'store': record['store'] if isinstance(record['store'], str) else '|'.join(record['store'] or []),
+                'status': record['status'],
+                'error': record.get('error') or '',
+                'elapsed_s': record['elapsed_s'],
+            }
+            for prefix, key in (('lowest', 'lowest'), ('store', 'your_store')):
+                listing = (record.get('result') or {}).get(key) or {}
+                row[f'{prefix}_title'] = listing.get('title', '')
+                row[f'{prefix}_price'] = listing.get('price', '')
+                row[f'{prefix}_url'] = listing.get('url', '')
+            self.csv_writer.writerow(row)
+        else:
+            self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()
+
+    def close(self):
+        """Close the output file."""
+        self.file.close()
+
+
+def build_record(row, result, elapsed, error=None):
+    """
+    Build the output record for one search term.
+
+    Args:
+        row (dict): Input row from read_terms()
+        result (dict): Scrape result, or None if the scrape failed
+        elapsed (float): Seconds spent on the term
+        error (str): Error message if the scrape raised
+
+    Returns:
+        dict: Output record
+    """
+    if error:
+        status = 'error'
+    elif result:
+        status = 'ok'
+    else:
+        status = 'not_found'
+
+    return {
+        'term': row['term'],
+        'region': row['region'],
+        'store': row['store'],
+        'status': status,
+        'result': result,
+        'error': error,
+        'elapsed_s': round(elapsed, 2),
+    }
+
+
+def run_batch(input_path, output_path, headless=True, default_region='UK', direct_search=True,
+              history_path=None, scraper_options=None, timings_path=None,
+              metrics_port=None, metrics_path=None, selector_stats_path=None, adaptive_selectors=True,
+              fixture_url=None):
+    """
+    Scrape every term in the input file through one warm browser.
+
+    Args:
+        input_path (str): CSV or JSONL file of search terms
+        output_path (str): File that receives one result record per term
+        headless (bool): Whether to run the browser in headless mode (default: True)
+        default_region (str): Region for rows that don't name one (default: 'UK')
+        direct_search (bool): Use direct sorted-search navigation (default: True)
+        history_path (str): Optional SQLite file every price is also recorded to (default: None)
+        scraper_options (dict): Extra EbayScraper keyword arguments, e.g. search filters or
+            verify mode (default: None)
+        timings_path (str): Optional JSONL file that receives the phase timings of every
+            term (default: None)
+        metrics_port (int): Serve Prometheus metrics at http://127.0.0.1:<port>/metrics while
+            the batch runs (default: None)
+        metrics_path (str): Rewrite Prometheus metrics to this textfile every 15 seconds
+            (default: None)
+        selector_stats_path (str): Optional JSON file that accumulates the time every selector
+            candidate takes to match or fail (default: None)
+        adaptive_selectors (bool): Try the selector that last won in each region first, learned
+            in browser_data/selector_order.json (default: True)
+        fixture_url (str): Root URL of a fixture_server.py to scrape instead of eBay; each
+            region is served under <root>/<region> (default: None)
+
+    Returns:
+        dict: Counts of 'ok', 'not_found' and 'error' records
+    """
+    counts = {'ok': 0, 'not_found': 0, 'error': 0}
+    writer = ResultWriter(output_path)
+    history = PriceHistory(history_path) if history_path else None
+    timing_log = TimingLog(timings_path) if timings_path else None
+    metrics = ScraperMetrics() if metrics_port or metrics_path else None
+    selector_stats = SelectorStats(selector_stats_path) if selector_stats_path else None
+    selector_order = SelectorOrder(DEFAULT_ORDER_FILE) if adaptive_selectors else None
+    # One keep-alive HTTP client for every term when the HTTP backend is chosen
+    http_backend = HttpBackend() if (scraper_options or {}).get('backend') == 'http' else None
+    if metrics_port:
+        metrics.serve(metrics_port)
+    if metrics_path:
+        metrics.start_textfile_writer(metrics_path)
+
+    # HAR files are per term, so HAR runs get a fresh browser per term instead of the pool
+    har_mode = (scraper_options or {}).get('har_mode')
+
+    try:
+        with (nullcontext() if har_mode else BrowserPool(headless=headless)) as pool:
+            for index, row in enumerate(read_terms(input_path, default_region), start=1):
+                print(f"\n📦 [{index}] {row['term']} ({row['region']})")
+                scraper = EbayScraper(
+                    headless=headless,
+                    region=row['region'],
+                    direct_search=direct_search,
+                    pool=pool,
+                    history=history,
+                    timing_log=timing_log,
+                    metrics=metrics,
+                    selector_stats=selector_stats,
+                    selector_order=selector_order,
+                    http_backend=http_backend,
+                    base_url=f"{fixture_url.rstrip('/')}/{row['region'].lower()}" if fixture_url else None,
+                    **(scraper_options or {})
+                )
+
+                started = time.time()
+                error = None
+                result = None
+                try:
+                    result = scraper.scrape(row['term'], store_name=row['store'])
+                except Exception as e:
+                    error = str(e)
+                    print(f"❌ Error: {error}")
+
+                record = build_record(row, result, time.time() - started, error)
+                writer.write(record)
+                counts[record['status']] += 1
+    finally:
+        writer.close()
+        if history:
+            history.close()
+        if metrics:
+            metrics.close()
+        if http_backend:
+            http_backend.close()
+
+    return counts
+
+
+def main():
+    """Command-line entry point for batch runs."""
+    parser = argparse.ArgumentParser(description="Check a list of search terms on eBay in one run.")
+    parser.add_argument('input', help="CSV or JSONL file with 'term' and optional 'store' and 'region'")
+    parser.add_argument('output', help="Output file (.jsonl or .csv)")
+    parser.add_argument('--region', default='UK', help="Default eBay region (default: UK)")
+    parser.add_argument('--headed', action='store_true', help="Show the browser window")
+    parser.add_argument('--homepage-search', action='store_true',
+                        help="Search through the homepage instead of the direct sorted URL")
+    parser.add_argument('--history', metavar='DB',
+                        help="Also record every price to this SQLite price-history database")
+    parser.add_argument('--timings', metavar='JSONL',
+                        help="Also append the phase timings of every term to this file")
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help="Serve Prometheus metrics on this port at /metrics")
+    parser.add_argument('--metrics-file', metavar='PROM',
+                        help="Rewrite Prometheus metrics to this textfile every 15 seconds")
+    parser.add_argument('--selector-stats', metavar='JSON',
+                        help="Accumulate per-selector timings in this file (report: python selector_stats.py JSON)")
+    parser.add_argument('--fixed-selectors', action='store_true',
+                        help="Always try selectors in their default order instead of the learned one")
+    parser.add_argument('--backend', choices=EbayScraper.BACKENDS, default='browser',
+                        help="Fetch search results in the browser or over plain HTTP (default: browser)")
+    parser.add_argument('--fixture-url', metavar='URL',
+                        help="Scrape a fixture_server.py at this root URL instead of eBay")
+    parser.add_argument('--har', choices=EbayScraper.HAR_MODES,
+                        help="Record each term's traffic to browser_data/har/, or replay it from there")
+    parser.add_argument('--items-per-page', type=int, choices=EbayScraper.ITEMS_PER_PAGE,
+                        help="Listings per results page (_ipg)")
+    parser.add_argument('--buy-it-now', action='store_true', help="Only Buy It Now listings")
+    parser.add_argument('--condition', choices=sorted(EbayScraper.CONDITION_CODES),
+                        help="Only listings in this condition")
+    parser.add_argument('--location', choices=sorted(EbayScraper.LOCATION_CODES),
+                        help="Only listings shipping from this area")
+    parser.add_argument('--verify', choices=EbayScraper.VERIFY_MODES, default='top1',
+                        help="How many prices to confirm on product pages (default: top1)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"❌ Error: Input file not found: {args.input}")
+        sys.exit(1)
+
+    counts = run_batch(
+        args.input,
+        args.output,
+        headless=not args.headed,
+        default_region=args.region.upper(),
+        direct_search=not args.homepage_search,
+        history_path=args.history,
+        timings_path=args.timings,
+        metrics_port=args.metrics_port,
+        metrics_path=args.metrics_file,
+        selector_stats_path=args.selector_stats,
+        adaptive_selectors=not args.fixed_selectors,
+        fixture_url=args.fixture_url,
+        scraper_options={
+            'items_per_page': args.items_per_page,
+            'buy_it_now': args.buy_it_now,
+            'condition': args.condition,
+            'location': args.location,
+            'verify': args.verify,
+            'backend': args.backend,
+            'har_mode': args.har,
+        }
+    )
+
+    print()
+    print("=" * 60)
+    print(f"✅ {counts['ok']} found, ⚠️  {counts['not_found']} not found, ❌ {counts['error']} errors")
+    print(f"📄 Results written to {args.output}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the eBay Price Scraper
+Runs a set of search terms through each engine at several concurrency levels against the
+local stand-in eBay server, and reports latency percentiles, throughput, peak memory and
+Chromium process counts.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from browser_pool import BrowserPool
+from fixture_server import FixtureServer
+from http_backend import HttpBackend
+from scraper import EbayScraper
+
+
+ENGINES = ('sync', 'http', 'async')
+
+# Default directory for saved results
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_results')
+
+
+def percentile(values, share):
+    """
+    Percentile with linear interpolation between the closest ranks.
+
+    Args:
+        values (list): Numbers
+        share (float): Percentile as a fraction, e.g. 0.95
+
+    Returns:
+        float: The percentile, or None for an empty list
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * share
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return round(ordered[low] + (ordered[high] - ordered[low]) * (rank - low), 4)
+
+
+def summarize(values):
+    """
+    Summarize a list of durations.
+
+    Args:
+        values (list): Seconds
+
+    Returns:
+        dict: 'p50', 'p95', 'p99', 'mean' and 'n'
+    """
+    return {
+        'p50': percentile(values, 0.50),
+        'p95': percentile(values, 0.95),
+        'p99': percentile(values, 0.99),
+        'mean': round(sum(values) / len(values), 4) if values else None,
+        'n': len(values),
+    }
+
+
+class TimingCollector:
+    """Keeps the phase timings of every scrape in memory; used as an EbayScraper timing_log."""
+
+    def __init__(self):
+        """Initialize an empty collector."""
+        self.records = []
+        self.lock = threading.Lock()
+
+    def write(self, region, search_term, timer, ok):
+        """Store one scrape's phase totals (same signature as TimingLog.write)."""
+        with self.lock:
+            self.records.append({'ok': ok, 'phases': timer.phase_totals()})
+
+    def phase_summary(self):
+        """
+        Percentiles of every phase over the recorded scrapes.
+
+        Returns:
+            dict: Phase name to summarize() output
+        """
+        phases = {}
+        with self.lock:
+            for record in self.records:
+                for phase, seconds in record['phases'].items():
+                    phases.setdefault(phase, []).append(seconds)
+        return {phase: summarize(values) for phase, values in phases.items()}
+
+
+class ProcessSampler:
+    """Samples the resident memory of this process and its children, and counts Chromium processes."""
+
+    def __init__(self, interval=0.2):
+        """
+        Initialize the sampler.
+
+        Args:
+            interval (float): Seconds between samples (default: 0.2)
+        """
+        self.interval = interval
+        self.peak_rss = 0
+        self.peak_chromium = 0
+        self.stopping = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Start sampling from a background thread."""
+        self.thread = threading.Thread(target=self.sample_loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop sampling and take a last sample."""
+        self.stopping.set()
+        if self.thread:
+            self.thread.join()
+        self.sample()
+
+    def sample_loop(self):
+        while not self.stopping.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        """Record the current memory and Chromium process count if they are a new peak."""
+        processes = self.process_tree()
+        if processes is None:
+            return
+        rss = sum(rss for _, rss in processes)
+        chromium = sum(1 for name, _ in processes if 'chrom' in name.lower() or 'headless_shell' in name)
+        self.peak_rss = max(self.peak_rss, rss)
+        self.peak_chromium = max(self.peak_chromium, chromium)
+
+    def process_tree(self):
+        """
+        Read this process and all its descendants from /proc.
+
+        Returns:
+            list: (name, RSS bytes) per process, or None where /proc isn't available
+        """
+        if not os.path.isdir('/proc'):
+            return None
+
+        parents = {}
+        info = {}
+        page_size = os.sysconf('SC_PAGE_SIZE')
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat', encoding='utf-8', errors='replace') as f:
+                    stat = f.read()
+                with open(f'/proc/{entry}/statm', encoding='utf-8') as f:
+                    resident = int(f.read().split()[1]) * page_size
+            except (OSError, ValueError, IndexError):
+                continue
+            # The name is in parentheses and may itself contain spaces
+            name = stat[stat.find('(') + 1:stat.rfind(')')]
+            ppid = int(stat[stat.rfind(')') + 2:].split()[1])
+            parents.setdefault(ppid, []).append(int(entry))
+            info[int(entry)] = (name, resident)
+
+        tree = []
+        pending = [os.getpid()]
+        while pending:
+            pid = pending.pop()
+            if pid in info:
+                tree.append(info[pid])
+            pending.extend(parents.get(pid, []))
+        return tree
+
+
+def run_sync(terms, concurrency, make_scraper, use_pool):
+    """
+    Scrape the terms with EbayScraper on worker threads, each with its own browser.
+
+    Args:
+        terms (list): Search terms
+        concurrency (int): Worker threads
+        make_scraper (callable): Builds an EbayScraper given a BrowserPool (or None)
+        use_pool (bool): Give each worker a warm BrowserPool
+
+    Returns:
+        list: (seconds, ok) per term
+    """
+    chunks = [terms[index::concurrency] for index in range(concurrency)]
+
+    def worker(chunk):
+        outcomes = []
+        pool = BrowserPool(headless=True) if use_pool else None
+        try:
+            for term in chunk:
+                started = time.perf_counter()
+                try:
+                    ok = make_scraper(pool).scrape(term, use_cache=False) is not None
+                except Exception as e:
+                    print(f"❌ [{term}] {str(e)}")
+                    ok = False
+                outcomes.append((time.perf_counter() - started, ok))
+        finally:
+            if pool:
+                pool.close()
+        return outcomes
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return [outcome for outcomes in executor.map(worker, chunks) for outcome in outcomes]
+
+
+def run_async(terms, concurrency, base_url, region, verify):
+    """
+    Scrape the terms with AsyncEbayScraper.
+
+    Args:
+        terms (list): Search terms
+        concurrency (int): Pages driven at the same time
+        base_url (str): Stand-in server URL for the region
+        region (str): eBay region
+        verify (str): Verify mode
+
+    Returns:
+        list: (seconds, ok) per term
+    """
+    from async_scraper import AsyncEbayScraper
+
+    scraper = AsyncEbayScraper(headless=True, region=region, concurrency=concurrency, verify=verify,
+                               base_url=base_url)
+
+    async def timed_scrape(term):
+        started = time.perf_counter()
+        try:
+            ok = await scraper.scrape(term) is not None
+        except Exception as e:
+            print(f"❌ [{term}] {str(e)}")
+            ok = False
+        return time.perf_counter() - started, ok
+
+    async def run_all():
+        await scraper.start()
+        try:
+            return await asyncio.gather(*(timed_scrape(term) for term in terms))
+        finally:
+            await scraper.close()
+
+    return asyncio.run(run_all())
+
+
+def run_case(engine, concurrency, terms, base_url, region, verify):
+    """
+    Run one engine at one concurrency level and measure it.
+
+    Returns:
+        dict: Measurements for the case
+    """
+    print(f"\n⏱️  {engine} × {concurrency}: {len(terms)} terms")
+    collector = TimingCollector()
+    http_backend = HttpBackend() if engine == 'http' else None
+
+    def make_scraper(pool):
+        return EbayScraper(
+            headless=True,
+            region=region,
+            direct_search=True,
+            pool=pool,
+            verify=verify,
+            timing_log=collector,
+            backend='http' if engine == 'http' else 'browser',
+            http_backend=http_backend,
+            base_url=base_url,
+        )
+
+    sampler = ProcessSampler().start()
+    started = time.perf_counter()
+    try:
+        if engine == 'async':
+            outcomes = run_async(terms, concurrency, base_url, region, verify)
+        else:
+            use_pool = engine == 'sync' or verify != 'none'
+            outcomes = run_sync(terms, concurrency, make_scraper, use_pool)
+    finally:
+        wall = time.perf_counter() - started
+        sampler.stop()
+        if http_backend:
+            http_backend.close()
+
+    latencies = [seconds for seconds, _ in outcomes]
+    ok = sum(1 for _, success in outcomes if success)
+    return {
+        'engine': engine,
+        'concurrency': concurrency,
+        'terms': len(terms),
+        'ok': ok,
+        'failed': len(terms) - ok,
+        'wall_s': round(wall, 3),
+        'terms_per_min': round(len(terms) / wall * 60, 2) if wall else None,
+        'latency': summarize(latencies),
+        'phases': collector.phase_summary(),
+        'peak_rss_mb': round(sampler.peak_rss / 1024 / 1024, 1) if sampler.peak_rss else None,
+        'peak_chromium_processes': sampler.peak_chromium,
+    }
+
+
+def git_commit():
+    """
+    Current commit of the working tree, to label saved results.
+
+    Returns:
+        str: Commit hash, or None outside a git checkout
+    """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(runs):
+    """Print one line per case."""
+    print()
+    print("=" * 96)
+    print(f"{'ENGINE':<8}{'CONC':>5}{'OK':>6}{'TERMS/MIN':>11}{'P50 S':>9}{'P95 S':>9}{'P99 S':>9}"
+          f"{'PEAK RSS MB':>13}{'CHROMIUM':>10}")
+    for run in runs:
+        latency = run['latency']
+        print(f"{run['engine']:<8}{run['concurrency']:>5}{run['ok']:>6}{run['terms_per_min'] or 0:>11.1f}"
+              f"{latency['p50'] or 0:>9.2f}{latency['p95'] or 0:>9.2f}{latency['p99'] or 0:>9.2f}"
+              f"{run['peak_rss_mb'] or 0:>13.1f}{run['peak_chromium_processes']:>10}")
+        for phase, stats in run['phases'].items():
+            print(f"{'':<13}{phase:<16}p50 {stats['p50']:.3f}  p95 {stats['p95']:.3f}  p99 {stats['p99']:.3f}")
+    print("=" * 96)
+
+
+def compare(runs, baseline_path):
+    """
+    Print throughput and p50 changes against a saved results file.
+
+    Args:
+        runs (list): Runs of this benchmark
+        baseline_path (str): Results JSON of an earlier benchmark
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(run['engine'], run['concurrency']): run for run in baseline['runs']}
+
+    print(f"\n📊 Compared with {baseline_path} ({baseline.get('commit') or 'unknown commit'}):")
+    for run in runs:
+        old = previous.get((run['engine'], run['concurrency']))
+        if not old or not old['terms_per_min'] or not old['latency']['p50']:
+            continue
+        throughput = (run['terms_per_min'] / old['terms_per_min'] - 1) * 100
+        p50 = (run['latency']['p50'] / old['latency']['p50'] - 1) * 100
+        print(f"   {run['engine']} × {run['concurrency']}: terms/min {throughput:+.1f}%, p50 {p50:+.1f}%")
+
+
+def main():
+    """Command-line entry point for benchmark runs."""
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against the local stand-in eBay.")
+    parser.add_argument('--terms', type=int, default=20, help="Number of search terms (default: 20)")
+    parser.add_argument('--terms-file', help="Read search terms from this file, one per line")
+    parser.add_argument('--engines', nargs='+', choices=ENGINES, default=['sync', 'http'],
+                        help="Engines to run (default: sync http)")
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 2, 4],
+                        help="Concurrency levels (default: 1 2 4)")
+    parser.add_argument('--region', default='UK', help="eBay region (default: UK)")
+    parser.add_argument('--verify', choices=EbayScraper.VERIFY_MODES, default='none',
+                        help="Verify mode for every scrape (default: none)")
+    parser.add_argument('--latency', type=float, default=0.05, help="Stand-in server latency in seconds")
+    parser.add_argument('--jitter', type=float, default=0.05, help="Stand-in server latency jitter in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument('--fixture-url', metavar='URL',
+                        help="Use a fixture_server.py already running at this root URL")
+    parser.add_argument('--output', help="Results file (default: benchmark_results/<time>-<commit>.json)")
+    parser.add_argument('--compare', metavar='JSON', help="Print changes against an earlier results file")
+    args = parser.parse_args()
+
+    region = args.region.upper()
+    if args.terms_file:
+        with open(args.terms_file, encoding='utf-8') as f:
+            terms = [line.strip() for line in f if line.strip()]
+    else:
+        terms = [f"benchmark product {index}" for index in range(1, args.terms + 1)]
+
+    server = None
+    if args.fixture_url:
+        base_url = f"{args.fixture_url.rstrip('/')}/{region.lower()}"
+    else:
+        server = FixtureServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=1).start()
+        base_url = server.base_url(region)
+
+    runs = []
+    try:
+        for engine in args.engines:
+            for concurrency in args.concurrency:
+                runs.append(run_case(engine, concurrency, terms, base_url, region, args.verify))
+    finally:
+        if server:
+            server.stop()
+
+    print_report(runs)
+
+    commit = git_commit()
+    results = {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'config': {
+            'terms': len(terms),
+            'region': region,
+            'verify': args.verify,
+            'latency': args.latency,
+            'jitter': args.jitter,
+            'error_rate': args.error_rate,
+            'fixture_url': args.fixture_url,
+        },
+        'runs': runs,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{commit or 'nocommit'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"📄 Results written to {output}")
+
+    if args.compare:
+        compare(runs, args.compare)
+
+
+if __name__ == "__main__":
+    main()
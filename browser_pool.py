@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Warm browser pool for the eBay Price Scraper
+Keeps one Chromium browser and a few ready contexts per region alive across scrapes.
+"""
+
+from playwright.sync_api import sync_playwright
+
+from scraper import EbayScraper
+
+
+class PooledContext:
+    """A browser context owned by the pool, with its page and usage counters."""
+
+    def __init__(self, region, context, page, cookies_file, warm):
+        """
+        Initialize the pooled context.
+
+        Args:
+            region (str): eBay region the context was configured for
+            context: Playwright browser context
+            page: The context's working page
+            cookies_file (str): Path the context's storage state is saved to
+            warm (dict): Warm-up already done in the context (see EbayScraper.saved_warm_state())
+        """
+        self.region = region
+        self.context = context
+        self.page = page
+        self.cookies_file = cookies_file
+        self.warm = warm
+        self.pages_loaded = 0
+
+        # Count every page load, including extra tabs, so the context can be recycled after enough pages
+        self.page.on('load', self.on_page_load)
+        self.context.on('page', self.on_new_page)
+
+    def on_new_page(self, page):
+        """Start counting loads on a tab opened in the context."""
+        page.on('load', self.on_page_load)
+
+    def on_page_load(self, page=None):
+        """Count a finished page load."""
+        self.pages_loaded += 1
+
+
+class BrowserPool:
+    """One long-lived browser with warm contexts per region that scrapes borrow and return."""
+
+    def __init__(self, headless=True, contexts_per_region=1, max_pages_per_context=100):
+        """
+        Initialize the pool.
+
+        Args:
+            headless (bool): Whether to run the pooled browser in headless mode (default: True)
+            contexts_per_region (int): Number of idle contexts kept warm per region (default: 1)
+            max_pages_per_context (int): Page loads after which a context is recycled (default: 100)
+        """
+        self.headless = headless
+        self.contexts_per_region = contexts_per_region
+        self.max_pages_per_context = max_pages_per_context
+        self.playwright = None
+        self.browser = None
+        self.idle = {}
+        self.in_use = {}
+
+    def start(self):
+        """Launch the shared browser, reusing the running Playwright driver if there is one."""
+        if self.browser:
+            return
+
+        print("🚀 Launching pooled browser...")
+        if self.playwright is None:
+            self.playwright = sync_playwright().start()
+        self.browser = self.playwright.chromium.launch(
+            headless=self.headless,
+            args=['--start-maximized']
+        )
+        print("✅ Pooled browser launched\n")
+
+    def acquire(self, scraper):
+        """
+        Borrow a warm context for the scraper's region, creating one if none is idle.
+
+        Args:
+            scraper (EbayScraper): Scraper that will use the context
+
+        Returns:
+            tuple: (context, page) ready for navigation
+        """
+        if not self.browser or not self.browser.is_connected():
+            if self.browser:
+                print("⚠️  Pooled browser disconnected, relaunching...")
+            # Contexts of the old browser are gone with it; relaunch on the same driver
+            self.browser = None
+            self.idle.clear()
+            self.in_use.clear()
+            self.start()
+
+        idle = self.idle.setdefault(scraper.region, [])
+        while idle:
+            pooled = idle.pop()
+            if self.is_healthy(pooled):
+                break
+            self.retire(pooled, save_state=False)
+        else:
+            print(f"🧩 Creating pooled context for {scraper.region}...")
+            context = scraper.new_context(self.browser)
+            pooled = PooledContext(
+                scraper.region, context, context.new_page(), scraper.cookies_file, scraper.saved_warm_state()
+            )
+
+        scraper.cookies_file = pooled.cookies_file
+        # Shared, so warm-up done by one scrape counts for every later borrower of the context
+        scraper.warm = pooled.warm
+        self.in_use[id(pooled.context)] = pooled
+        return pooled.context, pooled.page
+
+    def release(self, scraper, healthy=True):
+        """
+        Return the scraper's borrowed context to the pool.
+
+        Args:
+            scraper (EbayScraper): Scraper that borrowed the context
+            healthy (bool): False if the scrape failed and the context should be discarded
+        """
+        pooled = self.in_use.pop(id(scraper.context), None)
+        if pooled is None:
+            return
+
+        idle = self.idle.setdefault(pooled.region, [])
+        if (not healthy
+                or pooled.pages_loaded >= self.max_pages_per_context
+                or len(idle) >= self.contexts_per_region
+                or not self.is_healthy(pooled)):
+            self.retire(pooled, save_state=healthy)
+            return
+
+        idle.append(pooled)
+
+    def is_healthy(self, pooled):
+        """
+        Check that a pooled context can still run scripts.
+
+        Args:
+            pooled (PooledContext): Context to check
+
+        Returns:
+            bool: True if the context's page responds, False otherwise
+        """
+        try:
+            if pooled.page.is_closed() or not self.browser.is_connected():
+                return False
+            return pooled.page.evaluate('1') == 1
+        except Exception:
+            return False
+
+    def retire(self, pooled, save_state=True):
+        """
+        Close a pooled context, saving its cookies first.
+
+        Args:
+            pooled (PooledContext): Context to close
+            save_state (bool): Whether to save the storage state before closing
+        """
+        if save_state:
+            try:
+                EbayScraper.write_storage_state(pooled.context.storage_state(), pooled.cookies_file)
+            except Exception as e:
+                print(f"⚠️  Could not save cookies: {str(e)}")
+
+        try:
+            pooled.context.close()
+        except Exception:
+            pass
+
+    def close(self):
+        """Close every pooled context and the shared browser."""
+        for pooled in list(self.in_use.values()):
+            self.retire(pooled)
+        for idle in self.idle.values():
+            for pooled in idle:
+                self.retire(pooled)
+        self.in_use.clear()
+        self.idle.clear()
+
+        if self.browser:
+            print("\n🔒 Closing pooled browser...")
+            try:
+                self.browser.close()
+            except Exception:
+                pass
+            self.browser = None
+        if self.playwright:
+            self.playwright.stop()
+            self.playwright = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Local stand-in eBay server for the eBay Price Scraper
+Serves homepage, search results and product pages for every region without a network,
+with configurable latency and error injection, so benchmarks and regression runs are
+reproducible. Point a scraper at it with EbayScraper(base_url=server.base_url(region)).
+"""
+
+import argparse
+import hashlib
+import html
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from scraper import EbayScraper
+
+
+# How each region displays a price
+PRICE_FORMATS = {
+    'UK': lambda value: f'£{value:,.2f}',
+    'US': lambda value: f'${value:,.2f}',
+    'DE': lambda value: 'EUR ' + f'{value:,.2f}'.replace(',', ' ').replace('.', ',').replace(' ', '.'),
+    'FR': lambda value: f'{value:,.2f}'.replace(',', ' ').replace('.', ',') + ' EUR',
+    'AU': lambda value: f'AU ${value:,.2f}',
+    'CA': lambda value: f'C ${value:,.2f}',
+}
+
+# Sellers the generated listings are spread over; include these in store-matching tests
+FIXTURE_SELLERS = ['bestdeals_uk', 'gadgetworld', 'uniquesellingmart', 'tech-outlet', 'bargainbin']
+
+# Search terms containing this word get eBay's "no exact matches" page
+NO_RESULTS_WORD = 'noresults'
+
+# Total listings generated per search term
+LISTINGS_PER_TERM = 500
+
+# Captured pages, if a fixtures directory is given: <dir>/<REGION>/<name>
+CAPTURED_PAGES = {'home': 'home.html', 'search': 'search.html', 'item': 'item.html'}
+
+CONSENT_BANNER = """
+<div id="gdpr-banner">
+  <button id="gdpr-banner-accept" class="gdpr-banner-accept"
+    onclick="document.cookie='dp1=bpbf/%23e000e000000000000000000^; path=/'; this.parentNode.remove();">
+    Accept all
+  </button>
+</div>
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+{banner}
+<form id="gh-f" action="{prefix}/sch/i.html" method="get">
+  <input type="text" id="gh-ac" name="_nkw" placeholder="Search for anything" value="{term}">
+  <input type="submit" id="gh-btn" class="btn-prim" value="Search">
+</form>
+{body}
+</body></html>
+"""
+
+
+def term_seed(*parts):
+    """
+    Derive a stable random seed from some strings, so a term always gets the same listings.
+
+    Returns:
+        int: Seed
+    """
+    return int(hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:12], 16)
+
+
+def generate_listings(region, term):
+    """
+    Generate the full, unsorted set of listings for a search term.
+
+    Args:
+        region (str): eBay region
+        term (str): Search term
+
+    Returns:
+        list: Dicts with 'listing_id', 'title', 'price', 'shipping', 'seller' and 'variations'
+    """
+    rng = random.Random(term_seed(region, term.lower()))
+    base = rng.uniform(5, 900)
+    listings = []
+    for index in range(LISTINGS_PER_TERM):
+        listings.append({
+            'listing_id': str(100000000000 + term_seed(region, term.lower(), str(index)) % 900000000000),
+            'title': f"{term.title()} - Listing {index + 1}",
+            'price': round(base * rng.uniform(0.6, 1.8), 2),
+            'shipping': 0.0 if rng.random() < 0.5 else round(rng.uniform(1, 9), 2),
+            'seller': FIXTURE_SELLERS[rng.randrange(len(FIXTURE_SELLERS))],
+            'variations': rng.random() < 0.05,
+        })
+    return listings
+
+
+def display_price(region, listing):
+    """
+    Format a generated listing's price the way the region shows it, as a range for
+    listings with variations.
+
+    Args:
+        region (str): eBay region
+        listing (dict): Listing from generate_listings()
+
+    Returns:
+        str: Displayed price, e.g. '£12.99' or '£12.99 to £25.98'
+    """
+    price_format = PRICE_FORMATS.get(region, PRICE_FORMATS['UK'])
+    price = price_format(listing['price'])
+    if listing['variations']:
+        price = f"{price} to {price_format(listing['price'] * 2)}"
+    return price
+
+
+class FixtureServer:
+    """Threaded HTTP server that imitates eBay's pages for every region."""
+
+    def __init__(self, port=0, host='127.0.0.1', latency=0.0, jitter=0.0, error_rate=0.0,
+                 challenge_rate=0.0, fixtures_dir=None, seed=None):
+        """
+        Initialize the server.
+
+        Args:
+            port (int): Port to listen on; 0 picks a free one (default: 0)
+            host (str): Address to bind (default: '127.0.0.1')
+            latency (float): Seconds added to every response (default: 0.0)
+            jitter (float): Up to this many extra seconds, chosen at random per response (default: 0.0)
+            error_rate (float): Share of page requests answered with HTTP 503 (default: 0.0)
+            challenge_rate (float): Share of page requests redirected to a bot challenge page
+                (default: 0.0)
+            fixtures_dir (str): Optional directory of captured pages, <dir>/<REGION>/home.html,
+                search.html and item.html, served instead of the generated ones (default: None)
+            seed (int): Seed for latency and error injection (default: None)
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.challenge_rate = challenge_rate
+        self.fixtures_dir = fixtures_dir
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        # Listings shown on a results page, by (region, listing ID), for their product pages
+        self.listings = {}
+        self.httpd = None
+        self.thread = None
+
+    def base_url(self, region='UK'):
+        """
+        URL to hand to EbayScraper(base_url=...) for a region.
+
+        Args:
+            region (str): eBay region (default: 'UK')
+
+        Returns:
+            str: Base URL of the region's stand-in site
+        """
+        return f"http://{self.host}:{self.port}/{region.lower()}"
+
+    def start(self):
+        """Start serving from a background thread."""
+        server = self
+
+        class FixtureHandler(BaseHTTPRequestHandler):
+            # Keep connections alive like eBay does, so HTTP clients can reuse them
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port), FixtureHandler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_port
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        print(f"🧪 Fixture server running at http://{self.host}:{self.port}/<region>")
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def inject(self):
+        """
+        Draw this request's delay and injected failure.
+
+        Returns:
+            tuple: (seconds to sleep, 'error', 'challenge' or None)
+        """
+        with self.lock:
+            self.requests += 1
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+            roll = self.random.random()
+        if roll < self.error_rate:
+            return delay, 'error'
+        if roll < self.error_rate + self.challenge_rate:
+            return delay, 'challenge'
+        return delay, None
+
+    def handle(self, request):
+        """
+        Answer one GET request.
+
+        Args:
+            request (BaseHTTPRequestHandler): The request being handled
+        """
+        url = urlparse(request.path)
+        parts = [part for part in url.path.split('/') if part]
+        region = parts[0].upper() if parts and parts[0].upper() in EbayScraper.EBAY_REGIONS else None
+        if region is None:
+            if parts and parts[0] == 'splashui':
+                self.send(request, 200, '<html><body><h1>Pardon Our Interruption</h1></body></html>')
+            else:
+                self.send(request, 404, 'Not found')
+            return
+
+        route = parts[1:]
+        prefix = f"/{region.lower()}"
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        consented = 'dp1=' in (request.headers.get('Cookie') or '')
+
+        delay, failure = self.inject()
+        if delay:
+            time.sleep(delay)
+        if failure == 'error':
+            self.send(request, 503, 'Service unavailable')
+            return
+        if failure == 'challenge':
+            request.send_response(302)
+            request.send_header('Location', '/splashui/challenge?ap=1')
+            request.send_header('Content-Length', '0')
+            request.end_headers()
+            return
+
+        if not route:
+            page = self.captured(region, 'home') or self.home_page(region, prefix, consented)
+        elif route[:1] == ['sch']:
+            page = self.captured(region, 'search') or self.search_page(region, prefix, query, consented)
+        elif route[:1] == ['itm'] and len(route) > 1:
+            page = self.captured(region, 'item') or self.item_page(region, prefix, route[-1], consented)
+        else:
+            self.send(request, 404, 'Not found')
+            return
+        self.send(request, 200, page)
+
+    def send(self, request, status, body):
+        """Write a complete HTML response."""
+        payload = body.encode('utf-8')
+        request.send_response(status)
+        request.send_header('Content-Type', 'text/html; charset=utf-8')
+        request.send_header('Content-Length', str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def captured(self, region, name):
+        """
+        Read a captured page from the fixtures directory, if there is one.
+
+        Returns:
+            str: Page HTML, or None to use the generated page
+        """
+        if not self.fixtures_dir:
+            return None
+        path = os.path.join(self.fixtures_dir, region, CAPTURED_PAGES[name])
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
+    def render(self, title, prefix, body, consented, term=''):
+        """Wrap a page body in the shared header, search form and consent banner."""
+        return PAGE_TEMPLATE.format(
+            title=html.escape(title),
+            banner='' if consented else CONSENT_BANNER,
+            prefix=prefix,
+            term=html.escape(term, quote=True),
+            body=body,
+        )
+
+    def home_page(self, region, prefix, consented):
+        """Generated homepage: the search form and the consent banner."""
+        return self.render(f'eBay {region}', prefix, '<main id="mainContent"></main>', consented)
+
+    def search_page(self, region, prefix, query, consented):
+        """Generated results page honouring _nkw, _sop=15, _ipg and _pgn."""
+        term = ' '.join(query.get('_nkw', '').split())
+        if not term or NO_RESULTS_WORD in term.lower():
+            body = '<div class="srp-save-null-search"><h3>No exact matches found</h3></div>'
+            return self.render(f'{term} | eBay', prefix, body, consented, term)
+
+        listings = generate_listings(region, term)
+        with self.lock:
+            self.listings.update(((region, listing['listing_id']), listing) for listing in listings)
+        if query.get('_sop') == '15':
+            listings.sort(key=lambda listing: listing['price'] + listing['shipping'])
+
+        per_page = int(query.get('_ipg') or 60)
+        page_number = max(1, int(query.get('_pgn') or 1))
+        last_page = (len(listings) - 1) // per_page + 1
+        # eBay serves the last page again past the end of the results
+        page_number = min(page_number, last_page)
+        start = (page_number - 1) * per_page
+        price_format = PRICE_FORMATS.get(region, PRICE_FORMATS['UK'])
+
+        cards = []
+        for offset, listing in enumerate(listings[start:start + per_page]):
+            position = start + offset + 1
+            price = display_price(region, listing)
+            shipping = 'Free postage' if not listing['shipping'] else f"+{price_format(listing['shipping'])} postage"
+            cards.append(
+                f'<li class="s-card s-card--horizontal" data-listingid="{listing["listing_id"]}" '
+                f'data-view="mi:1686|iid:{position}">'
+                f'<a class="s-card__link" href="{prefix}/itm/{listing["listing_id"]}">'
+                f'<div class="s-card__title"><span class="su-styled-text primary">{html.escape(listing["title"])}</span></div></a>'
+                f'<div class="s-card__attribute-row"><span class="s-card__price">{price}</span></div>'
+                f'<div class="s-card__attribute-row"><span class="su-styled-text">{shipping}</span></div>'
+                f'<div class="s-card__seller-info"><span class="su-styled-text">{listing["seller"]}</span></div>'
+                f'</li>'
+            )
+        body = f'<ul class="srp-results srp-list">{"".join(cards)}</ul>'
+        return self.render(f'{term} | eBay', prefix, body, consented, term)
+
+    def item_page(self, region, prefix, listing_id, consented):
+        """
+        Generated product page with the price in eBay's x-price-primary markup.
+
+        Listings shown on a results page get the same price (or range) as their card; other
+        IDs get a stable random price.
+        """
+        with self.lock:
+            listing = self.listings.get((region, listing_id))
+        if listing is None:
+            rng = random.Random(term_seed(region, listing_id))
+            listing = {'title': f'Item {listing_id}', 'price': round(rng.uniform(5, 900), 2), 'variations': False}
+        price = display_price(region, listing)
+        body = (
+            f'<h1 class="x-item-title__mainTitle"><span class="ux-textspans">{html.escape(listing["title"])}</span></h1>'
+            f'<div class="x-bin-price__content"><div class="x-price-primary">'
+            f'<span class="ux-textspans">{price}</span></div></div>'
+        )
+        return self.render(f'Item {listing_id} | eBay', prefix, body, consented)
+
+
+def main():
+    """Run the fixture server until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve stand-in eBay pages for offline runs.")
+    parser.add_argument('--port', type=int, default=8800, help="Port to listen on (default: 8800)")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Up to this many extra seconds per response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument('--challenge-rate', type=float, default=0.0,
+                        help="Share of requests redirected to a challenge page")
+    parser.add_argument('--fixtures', metavar='DIR', help="Directory of captured pages per region")
+    parser.add_argument('--seed', type=int, help="Seed for latency and error injection")
+    args = parser.parse_args()
+
+    server = FixtureServer(
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        challenge_rate=args.challenge_rate,
+        fixtures_dir=args.fixtures,
+        seed=args.seed,
+    ).start()
+    for region in EbayScraper.EBAY_REGIONS:
+        print(f"   {region}: {server.base_url(region)}")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\n🔒 Stopping fixture server...")
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import threading
 from scraper import EbayScraper
+from result_cache import ResultCache, DEFAULT_CACHE_FILE
+from price_history import PriceHistory, DEFAULT_HISTORY_DB
 
 
 class EbayScraperGUI:
@@ -27,6 +29,13 @@ class EbayScraperGUI:
         self.scraper = None
         self.is_scraping = False
 
+        # Repeated searches for the same product within a few minutes reuse the last result
+        self.cache = ResultCache(ttl=300, path=DEFAULT_CACHE_FILE)
+
+        # Every search result is also kept in the price history database
+        self.history = PriceHistory(DEFAULT_HISTORY_DB)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         self.setup_ui()
 
     def setup_ui(self):
@@ -95,14 +104,25 @@ class EbayScraperGUI:
         self.store_entry.grid(row=0, column=1, sticky=(tk.W, tk.E))
         self.store_entry.insert(0, "uniquesellingmart")
 
-        # Headless mode checkbox
+        # Options: headless mode and result cache
+        options_frame = ttk.Frame(input_frame)
+        options_frame.grid(row=3, column=0, sticky=tk.W, pady=(0, 10))
+
         self.headless_var = tk.BooleanVar(value=False)
         headless_check = ttk.Checkbutton(
-            input_frame,
+            options_frame,
             text="Run in headless mode (no browser window)",
             variable=self.headless_var
         )
-        headless_check.grid(row=3, column=0, sticky=tk.W, pady=(0, 10))
+        headless_check.pack(side=tk.LEFT, padx=(0, 15))
+
+        self.use_cache_var = tk.BooleanVar(value=True)
+        cache_check = ttk.Checkbutton(
+            options_frame,
+            text="Use recent results (5 min)",
+            variable=self.use_cache_var
+        )
+        cache_check.pack(side=tk.LEFT)
 
         # Search button
         self.search_button = ttk.Button(
@@ -173,6 +193,11 @@ class EbayScraperGUI:
             self.search_entry.insert(0, "Enter product name (e.g., 'iPhone 15 Pro')")
             self.search_entry.config(foreground='grey')
 
+    def on_close(self):
+        """Write any pending price history and close the window."""
+        self.history.close()
+        self.root.destroy()
+
     def update_status(self, message):
         """Update the status label."""
         self.status_label.config(text=message)
@@ -243,10 +268,10 @@ class EbayScraperGUI:
             region = self.region_var.get()
             store_name = self.store_entry.get().strip() or None
 
-            scraper = EbayScraper(headless=headless, region=region)
+            scraper = EbayScraper(headless=headless, region=region, cache=self.cache, history=self.history)
 
             # Run the scraper with optional store name
-            result = scraper.scrape(search_term, store_name=store_name)
+            result = scraper.scrape(search_term, store_name=store_name, use_cache=self.use_cache_var.get())
 
             # Schedule GUI update in main thread
             self.root.after(0, self.display_results, result, search_term)
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+HTTP backend for the eBay Price Scraper
+Fetches the sorted search results over plain HTTP and parses the result cards without
+a browser. Connections are kept alive between requests, through httpx when it is
+installed and a small pool of http.client connections otherwise.
+"""
+
+import gzip
+import http.client
+import json
+import os
+import re
+import threading
+import zlib
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+# Status codes and page markers of eBay's bot challenge and rate limiting
+CHALLENGE_STATUS_CODES = (403, 429, 503)
+CHALLENGE_MARKERS = (
+    '/splashui/challenge',
+    '/splashui/captcha',
+    'pardon our interruption',
+    'checking your browser before you access',
+)
+
+# Marker of eBay's "no exact matches" results page
+NO_RESULTS_MARKER = 'srp-save-null-search'
+
+# Class names behind EbayScraper's CARD_* and LINK_SELECTORS, for the HTML parser
+CARD_CLASSES = {'s-card', 's-item'}
+LINK_CLASSES = {'s-card__link', 's-item__link'}
+TITLE_CLASSES = {'su-styled-text', 's-card__title', 's-item__title'}
+PRICE_CLASSES = {'s-card__price', 's-item__price'}
+SHIPPING_CLASSES = {'s-item__shipping', 's-item__logisticsCost', 's-card__shipping'}
+SELLER_CLASSES = {'s-item__seller-info-text', 's-card__seller-info'}
+
+# Elements that never have an end tag
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'source', 'track', 'wbr',
+}
+
+SHIPPING_PATTERN = re.compile(r'postage|shipping|delivery', re.IGNORECASE)
+
+# Redirect statuses followed by the standard-library client, and how many hops are allowed
+REDIRECT_STATUS_CODES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+
+
+class ChallengeDetected(Exception):
+    """eBay answered with a bot challenge instead of search results."""
+
+
+class SearchResultsParser(HTMLParser):
+    """Reads the result cards of a search results page into the same dicts as EXTRACT_LISTINGS_JS."""
+
+    def __init__(self, base_url):
+        """
+        Initialize the parser.
+
+        Args:
+            base_url (str): URL of the page, for resolving relative links
+        """
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.listings = []
+        self.card = None
+        self.stack = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = set((attrs.get('class') or '').split())
+
+        if self.card is None:
+            if tag == 'li' and classes & CARD_CLASSES:
+                iid = re.search(r'iid:(\d+)', attrs.get('data-view') or '')
+                self.card = {
+                    'listing_id': attrs.get('data-listingid'),
+                    'position': int(iid.group(1)) if iid else None,
+                    'fields': {},
+                    'done': set(),
+                    'url': None,
+                    'link_text': [],
+                    'text': [],
+                    'hrefs': [],
+                    'shipping_row': None,
+                }
+                self.stack = [(tag, ())]
+            return
+
+        href = attrs.get('href')
+        if tag == 'a' and href:
+            self.card['hrefs'].append(urljoin(self.base_url, href))
+
+        # Start capturing each field at the first element that carries it
+        fields = []
+        in_link = any('link' in opened for _, opened in self.stack)
+        if (tag == 'a' and self.card['url'] is None and href
+                and (classes & LINK_CLASSES) and ('s-item__link' in classes or '/itm/' in href)):
+            self.card['url'] = urljoin(self.base_url, href)
+            fields.append('link')
+        if in_link and classes & TITLE_CLASSES:
+            fields.append('title')
+        if classes & PRICE_CLASSES:
+            fields.append('price')
+        if classes & SHIPPING_CLASSES:
+            fields.append('shipping')
+        if classes & SELLER_CLASSES or any('seller-info' in name for name in classes):
+            fields.append('seller')
+        fields = tuple(
+            field for field in fields
+            if field not in self.card['done'] and field not in self.open_fields()
+        )
+
+        if tag not in VOID_ELEMENTS:
+            self.stack.append((tag, fields))
+
+    def handle_endtag(self, tag):
+        if self.card is None:
+            return
+
+        # Tolerate unclosed elements: close everything down to the matching start tag
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth][0] == tag:
+                break
+        else:
+            return
+
+        while len(self.stack) > depth:
+            _, fields = self.stack.pop()
+            self.card['done'].update(fields)
+
+        if not self.stack:
+            self.finish_card()
+
+    def handle_data(self, data):
+        if self.card is None:
+            return
+
+        self.card['text'].append(data)
+        for field in self.open_fields():
+            if field == 'link':
+                self.card['link_text'].append(data)
+            else:
+                self.card['fields'].setdefault(field, []).append(data)
+        if self.card['shipping_row'] is None and SHIPPING_PATTERN.search(data):
+            self.card['shipping_row'] = data
+
+    def open_fields(self):
+        """Fields whose element is currently open."""
+        return {field for _, fields in self.stack for field in fields}
+
+    def finish_card(self):
+        """Turn the finished card into a listing dict, skipping cards without a product link."""
+        card, self.card = self.card, None
+        # Cards with neither an iid nor a listing ID are placeholders like the hidden
+        # "Shop on eBay" card, not results
+        if not card['url'] or (card['position'] is None and not card['listing_id']):
+            return
+
+        def field_text(name):
+            return ' '.join(''.join(card['fields'].get(name, [])).split())
+
+        title = field_text('title') or ' '.join(''.join(card['link_text']).split())[:100]
+        shipping = field_text('shipping') or ' '.join((card['shipping_row'] or '').split())
+        match_text = ' '.join(' '.join(card['text']).split()) + ' ' + ' '.join(card['hrefs'])
+        self.listings.append({
+            'listing_id': card['listing_id'],
+            'title': title,
+            'price': field_text('price'),
+            'shipping': shipping,
+            'seller': field_text('seller'),
+            'position': card['position'],
+            'url': card['url'],
+            'match_text': match_text.lower(),
+        })
+
+
+def parse_search_results(html, base_url):
+    """
+    Parse every result card in a search results page.
+
+    Args:
+        html (str): Page HTML
+        base_url (str): URL of the page
+
+    Returns:
+        list: Listing dicts, as returned by EbayScraper.extract_listings()
+    """
+    parser = SearchResultsParser(base_url)
+    parser.feed(html)
+    parser.close()
+
+    # Cards without an iid rank after every card that has one, in page order
+    position = max([listing['position'] or 0 for listing in parser.listings] + [0])
+    for listing in parser.listings:
+        if listing['position'] is None:
+            position += 1
+            listing['position'] = position
+    return parser.listings
+
+
+def is_challenge(status, url, html):
+    """
+    Check whether a response is a bot challenge rather than a results page.
+
+    Args:
+        status (int): HTTP status code
+        url (str): Final URL after redirects
+        html (str): Response body
+
+    Returns:
+        bool: True if the browser should take over
+    """
+    if status in CHALLENGE_STATUS_CODES:
+        return True
+    head = (url + ' ' + html[:20000]).lower()
+    return any(marker in head for marker in CHALLENGE_MARKERS)
+
+
+class HttpBackend:
+    """Fetches search result pages over one pooled HTTP client, shared by any number of scrapers."""
+
+    def __init__(self, timeout=15.0, user_agent=None):
+        """
+        Initialize the backend.
+
+        Args:
+            timeout (float): Seconds allowed per request (default: 15.0)
+            user_agent (str): User agent sent with every request (default: the one the browser
+                contexts use)
+        """
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.client = None
+        # Idle keep-alive connections of the standard-library client, per (scheme, host:port)
+        self.connections = {}
+        self.lock = threading.Lock()
+
+    def headers(self, scraper):
+        """
+        Build request headers matching the scraper's browser context.
+
+        Args:
+            scraper (EbayScraper): Scraper whose region and saved cookies are used
+
+        Returns:
+            dict: Request headers
+        """
+        locale = scraper.GEOLOCATION_SETTINGS.get(scraper.region, scraper.GEOLOCATION_SETTINGS['UK'])['locale']
+        headers = {
+            'User-Agent': self.user_agent or scraper.USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': f"{locale},{locale.split('-')[0]};q=0.9",
+            'Accept-Encoding': 'gzip, deflate',
+        }
+        cookie = self.cookie_header(scraper.get_cookies_file(), urlparse(scraper.ebay_url).hostname)
+        if cookie:
+            headers['Cookie'] = cookie
+        return headers
+
+    def cookie_header(self, storage_state_path, host):
+        """
+        Build a Cookie header from the browser's saved storage state.
+
+        Args:
+            storage_state_path (str): Storage state JSON saved by the browser context
+            host (str): Host the request goes to
+
+        Returns:
+            str: Cookie header value, or '' if there are no saved cookies for the host
+        """
+        if not os.path.exists(storage_state_path):
+            return ''
+        try:
+            with open(storage_state_path, encoding='utf-8') as f:
+                cookies = json.load(f).get('cookies', [])
+        except (OSError, ValueError):
+            return ''
+
+        pairs = []
+        for cookie in cookies:
+            domain = cookie.get('domain', '').lstrip('.')
+            if host == domain or host.endswith('.' + domain):
+                pairs.append(f"{cookie['name']}={cookie['value']}")
+        return '; '.join(pairs)
+
+    def fetch(self, url, headers):
+        """
+        GET a page, decompressing it if needed.
+
+        Args:
+            url (str): Page URL
+            headers (dict): Request headers
+
+        Returns:
+            tuple: (status code, final URL, body text, body size in bytes)
+        """
+        if httpx is not None:
+            if self.client is None:
+                self.client = httpx.Client(follow_redirects=True, timeout=self.timeout)
+            response = self.client.get(url, headers=headers)
+            return response.status_code, str(response.url), response.text, response.num_bytes_downloaded
+
+        for _ in range(MAX_REDIRECTS + 1):
+            status, response_headers, body = self.request(url, headers)
+            location = response_headers.get('Location')
+            if status not in REDIRECT_STATUS_CODES or not location:
+                break
+            url = urljoin(url, location)
+
+        encoding = (response_headers.get('Content-Encoding') or '').lower()
+        charset = response_headers.get_content_charset() or 'utf-8'
+        size = len(body)
+        if encoding == 'gzip':
+            body = gzip.decompress(body)
+        elif encoding == 'deflate':
+            body = zlib.decompress(body)
+        return status, url, body.decode(charset, errors='replace'), size
+
+    def request(self, url, headers):
+        """
+        GET one URL over a pooled keep-alive connection, without following redirects.
+
+        A connection the server closed while it sat idle is replaced and the request
+        sent once more.
+
+        Args:
+            url (str): URL to fetch
+            headers (dict): Request headers
+
+        Returns:
+            tuple: (status code, response headers, raw body bytes)
+        """
+        parsed = urlparse(url)
+        key = (parsed.scheme, parsed.netloc)
+        path = (parsed.path or '/') + (f'?{parsed.query}' if parsed.query else '')
+
+        for attempt in range(2):
+            conn = self.checkout(key)
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if attempt:
+                    raise
+                continue
+
+            if response.will_close:
+                conn.close()
+            else:
+                self.checkin(key, conn)
+            return response.status, response.headers, body
+
+    def checkout(self, key):
+        """
+        Take an idle connection to a host from the pool, or open a new one.
+
+        Args:
+            key (tuple): (scheme, host:port)
+
+        Returns:
+            http.client.HTTPConnection: Connection for this request only
+        """
+        with self.lock:
+            idle = self.connections.get(key)
+            if idle:
+                return idle.pop()
+        scheme, netloc = key
+        connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return connection_class(netloc, timeout=self.timeout)
+
+    def checkin(self, key, conn):
+        """
+        Put a connection back in the pool for the next request to its host.
+
+        Args:
+            key (tuple): (scheme, host:port)
+            conn (http.client.HTTPConnection): Connection whose response was fully read
+        """
+        with self.lock:
+            self.connections.setdefault(key, []).append(conn)
+
+    def search(self, scraper, search_term, page_number=1):
+        """
+        Fetch and parse one page of the scraper's price-sorted search results.
+
+        Args:
+            scraper (EbayScraper): Scraper whose region, filters and saved cookies are used
+            search_term (str): The product to search for
+            page_number (int): Result page to fetch (default: 1)
+
+        Returns:
+            list: Listing dicts; empty if eBay reports no results
+
+        Raises:
+            ChallengeDetected: eBay served a bot challenge, or a page without any result cards
+        """
+        url = scraper.build_search_url(search_term, page_number)
+        print(f"🌐 Fetching {url} over HTTP...")
+
+        with scraper.timer.span('search'):
+            try:
+                status, final_url, html, size = self.fetch(url, self.headers(scraper))
+            except (OSError, http.client.HTTPException) as e:
+                raise ChallengeDetected(f"request failed: {str(e)}")
+            except Exception as e:
+                if httpx is not None and isinstance(e, httpx.HTTPError):
+                    raise ChallengeDetected(f"request failed: {str(e)}")
+                raise
+
+        if scraper.metrics:
+            scraper.metrics.bytes_downloaded.inc(size, region=scraper.region)
+        if is_challenge(status, final_url, html):
+            raise ChallengeDetected(f"challenge page (HTTP {status})")
+
+        if NO_RESULTS_MARKER in html:
+            # The cards under eBay's "no exact matches" banner match fewer words, not the
+            # search; the browser path reports no results for this page too
+            return []
+
+        with scraper.timer.span('parse'):
+            listings = parse_search_results(html, final_url)
+
+        if not listings:
+            # No cards and no "no results" banner: not a page we understand
+            raise ChallengeDetected(f"no result cards in the page (HTTP {status})")
+        return scraper.normalize_listings(listings)
+
+    def close(self):
+        """Close the pooled HTTP client and any idle connections."""
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+        with self.lock:
+            connections, self.connections = self.connections, {}
+        for idle in connections.values():
+            for conn in idle:
+                conn.close()
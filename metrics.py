@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Metrics for the eBay Price Scraper
+Prometheus-style counters and histograms, served over HTTP or written to a textfile.
+"""
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Latency buckets in seconds, from a quick card read up to a slow homepage search
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 21, 34, 60)
+
+
+def format_labels(names, values, extra=()):
+    """
+    Format a label set the way the Prometheus text format writes it.
+
+    Args:
+        names (tuple): Label names
+        values (tuple): Label values, in the same order
+        extra (tuple): Additional (name, value) pairs, e.g. a histogram's 'le'
+
+    Returns:
+        str: '{name="value",...}', or '' when there are no labels
+    """
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in pairs) + '}'
+
+
+def escape_label(value):
+    """
+    Escape a label value for the Prometheus text format.
+
+    Args:
+        value: Label value
+
+    Returns:
+        str: Value with backslashes, quotes and newlines escaped
+    """
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Counter:
+    """A monotonically increasing count per label set."""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        """
+        Initialize the counter.
+
+        Args:
+            name (str): Metric name, e.g. 'ebay_scrapes_total'
+            help_text (str): One-line description for the HELP line
+            labels (tuple): Label names
+        """
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        """
+        Add to the count for a label set.
+
+        Args:
+            amount (float): Amount to add (default: 1)
+            **labels: One value per label name
+        """
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self):
+        """
+        Render the counter in the Prometheus text format.
+
+        Returns:
+            list: Output lines
+        """
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.kind}']
+        with self.lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f'{self.name}{format_labels(self.labels, key)} {value}')
+        return lines
+
+
+class Histogram:
+    """Observations per label set, counted into cumulative buckets."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        """
+        Initialize the histogram.
+
+        Args:
+            name (str): Metric name, e.g. 'ebay_phase_seconds'
+            help_text (str): One-line description for the HELP line
+            labels (tuple): Label names
+            buckets (tuple): Upper bounds of the buckets, ascending (default: DEFAULT_BUCKETS)
+        """
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """
+        Record one observation.
+
+        Args:
+            value (float): Observed value, e.g. seconds
+            **labels: One value per label name
+        """
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self.lock:
+            entry = self.values.setdefault(key, {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0})
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry['counts'][index] += 1
+            entry['sum'] += value
+            entry['count'] += 1
+
+    def render(self):
+        """
+        Render the histogram in the Prometheus text format.
+
+        Returns:
+            list: Output lines
+        """
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.kind}']
+        with self.lock:
+            for key, entry in sorted(self.values.items()):
+                for bound, count in zip(self.buckets, entry['counts']):
+                    lines.append(f'{self.name}_bucket{format_labels(self.labels, key, [("le", bound)])} {count}')
+                lines.append(f'{self.name}_bucket{format_labels(self.labels, key, [("le", "+Inf")])} {entry["count"]}')
+                lines.append(f'{self.name}_sum{format_labels(self.labels, key)} {round(entry["sum"], 6)}')
+                lines.append(f'{self.name}_count{format_labels(self.labels, key)} {entry["count"]}')
+        return lines
+
+
+class ScraperMetrics:
+    """The scraper's counters and histograms, shared by every EbayScraper given it."""
+
+    def __init__(self):
+        """Create the metrics."""
+        self.scrapes = Counter(
+            'ebay_scrapes_total', 'Scrapes by region and outcome.', ('region', 'outcome'))
+        self.scrape_seconds = Histogram(
+            'ebay_scrape_seconds', 'Wall time of a whole scrape.', ('region',))
+        self.phase_seconds = Histogram(
+            'ebay_phase_seconds', 'Time spent in each scrape phase, excluding nested phases.', ('region', 'phase'))
+        self.selector_fallbacks = Counter(
+            'ebay_selector_fallbacks_total', 'Times a selector other than the first one matched.', ('region', 'step'))
+        self.timeouts = Counter(
+            'ebay_timeouts_total', 'Playwright timeouts hit, by step.', ('region', 'step'))
+        self.bytes_downloaded = Counter(
+            'ebay_bytes_downloaded_total', 'Response body bytes received, as transferred.', ('region',))
+        self.metrics = [
+            self.scrapes, self.scrape_seconds, self.phase_seconds,
+            self.selector_fallbacks, self.timeouts, self.bytes_downloaded,
+        ]
+        self.server = None
+        self.textfile_thread = None
+        self.stopping = threading.Event()
+
+    def record_scrape(self, region, outcome, timer):
+        """
+        Record a finished scrape.
+
+        Args:
+            region (str): eBay region searched
+            outcome (str): 'ok', 'cached', 'no_results', 'search_failed', 'not_found' or 'error'
+            timer (PhaseTimer): Timer holding the scrape's phase spans
+        """
+        self.scrapes.inc(region=region, outcome=outcome)
+        self.scrape_seconds.observe(time.perf_counter() - timer.started, region=region)
+        for phase, seconds in timer.phase_totals().items():
+            self.phase_seconds.observe(seconds, region=region, phase=phase)
+
+    def record_fallback(self, region, step, index):
+        """
+        Record which candidate of a selector list matched.
+
+        Args:
+            region (str): eBay region searched
+            step (str): Selector list the match came from, e.g. 'price'
+            index (int): Position of the matching selector in its list
+        """
+        if index > 0:
+            self.selector_fallbacks.inc(region=region, step=step)
+
+    def record_timeout(self, region, step):
+        """
+        Record a Playwright timeout.
+
+        Args:
+            region (str): eBay region searched
+            step (str): Step that timed out, e.g. 'search'
+        """
+        self.timeouts.inc(region=region, step=step)
+
+    def record_request(self, region, request):
+        """
+        Count the response body bytes of a finished network request.
+
+        Uses the size actually received, so chunked and compressed documents count too;
+        falls back to Content-Length when the browser can't report it.
+
+        Args:
+            region (str): eBay region searched
+            request: Playwright request that finished
+        """
+        try:
+            size = request.sizes()['responseBodySize']
+        except Exception:
+            size = 0
+        if size <= 0:
+            try:
+                size = int(request.response().headers.get('content-length') or 0)
+            except Exception:
+                return
+        if size > 0:
+            self.bytes_downloaded.inc(size, region=region)
+
+    def render(self):
+        """
+        Render every metric in the Prometheus text format.
+
+        Returns:
+            str: Exposition text
+        """
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port=9108, host='127.0.0.1'):
+        """
+        Serve the metrics at http://host:port/metrics from a background thread.
+
+        Args:
+            port (int): Port to listen on (default: 9108)
+            host (str): Address to bind (default: '127.0.0.1')
+
+        Returns:
+            ThreadingHTTPServer: The running server
+        """
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"📈 Serving metrics at http://{host}:{self.server.server_port}/metrics")
+        return self.server
+
+    def write_textfile(self, path):
+        """
+        Write the metrics to a file, replacing it atomically (for node_exporter's textfile collector).
+
+        Args:
+            path (str): File to write, conventionally ending in .prom
+        """
+        try:
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(self.render())
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️  Could not write metrics: {str(e)}")
+
+    def start_textfile_writer(self, path, interval=15.0):
+        """
+        Rewrite the metrics textfile every interval seconds from a background thread.
+
+        Args:
+            path (str): File to write
+            interval (float): Seconds between writes (default: 15.0)
+        """
+        def write_loop():
+            while not self.stopping.wait(interval):
+                self.write_textfile(path)
+            self.write_textfile(path)
+
+        self.textfile_thread = threading.Thread(target=write_loop, daemon=True)
+        self.textfile_thread.start()
+
+    def close(self):
+        """Stop the HTTP server and write the textfile one last time."""
+        self.stopping.set()
+        if self.textfile_thread:
+            self.textfile_thread.join()
+            self.textfile_thread = None
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Price history store for the eBay Price Scraper
+Records every scraped price in SQLite so prices can be looked up without re-scraping.
+"""
+
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+
+# Default database location, next to the saved cookies
+DEFAULT_HISTORY_DB = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'browser_data', 'price_history.db'
+)
+
+# Currency used when a price only shows a bare '$' or no symbol
+REGION_CURRENCIES = {
+    'UK': 'GBP',
+    'US': 'USD',
+    'DE': 'EUR',
+    'FR': 'EUR',
+    'AU': 'AUD',
+    'CA': 'CAD',
+}
+
+# Currency markers as eBay displays them, most specific first
+CURRENCY_MARKERS = [
+    ('AU $', 'AUD'),
+    ('AU$', 'AUD'),
+    ('C $', 'CAD'),
+    ('C$', 'CAD'),
+    ('US $', 'USD'),
+    ('US$', 'USD'),
+    ('GBP', 'GBP'),
+    ('EUR', 'EUR'),
+    ('£', 'GBP'),
+    ('€', 'EUR'),
+    ('¥', 'JPY'),
+]
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS observations (
+        id INTEGER PRIMARY KEY,
+        observed_at REAL NOT NULL,
+        region TEXT NOT NULL,
+        term TEXT NOT NULL,
+        role TEXT NOT NULL,
+        store TEXT,
+        listing_id TEXT,
+        seller TEXT,
+        title TEXT,
+        price REAL,
+        price_text TEXT,
+        currency TEXT,
+        url TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_observations_term
+        ON observations (term, region, role, observed_at);
+    CREATE INDEX IF NOT EXISTS idx_observations_listing
+        ON observations (listing_id, observed_at);
+"""
+
+COLUMNS = (
+    'observed_at', 'region', 'term', 'role', 'store', 'listing_id',
+    'seller', 'title', 'price', 'price_text', 'currency', 'url',
+)
+
+
+def normalize_term(search_term):
+    """
+    Normalize a search term so the same product is always stored under one key.
+
+    Args:
+        search_term (str): The product searched for
+
+    Returns:
+        str: Lowercased term with single spaces
+    """
+    return ' '.join(search_term.lower().split())
+
+
+def parse_price(price_text, region='UK'):
+    """
+    Parse a displayed price into a number and a currency code.
+
+    Handles both 1,234.56 and 1.234,56 styles. For ranges ("£5.00 to £20.00") the first
+    price is used.
+
+    Args:
+        price_text (str): Price as shown on eBay (e.g. '£12.99', 'EUR 1.234,50')
+        region (str): eBay region, used when the text has no unambiguous currency
+
+    Returns:
+        tuple: (float or None, currency code or None)
+    """
+    if not price_text:
+        return None, None
+
+    currency = REGION_CURRENCIES.get(region)
+    for marker, code in CURRENCY_MARKERS:
+        if marker in price_text:
+            currency = code
+            break
+
+    match = re.search(r'\d[\d.,\s]*', price_text)
+    if not match:
+        return None, currency
+
+    # Thousands may be separated by any space, e.g. a non-breaking one on eBay.fr
+    number = re.sub(r'\s', '', match.group(0))
+    if ',' in number and '.' in number:
+        # Whichever separator comes last is the decimal point
+        if number.rfind(',') > number.rfind('.'):
+            number = number.replace('.', '').replace(',', '.')
+        else:
+            number = number.replace(',', '')
+    elif ',' in number:
+        # A comma followed by exactly two digits is a decimal comma
+        if re.search(r',\d{2}$', number):
+            number = number.replace(',', '.')
+        else:
+            number = number.replace(',', '')
+
+    number = number.rstrip('.')
+    try:
+        return float(number), currency
+    except ValueError:
+        return None, currency
+
+
+def listing_id_from_url(url):
+    """
+    Extract the listing ID from a product URL.
+
+    Args:
+        url (str): Product URL (e.g. 'https://www.ebay.co.uk/itm/123456789')
+
+    Returns:
+        str: Listing ID, or None if the URL has none
+    """
+    match = re.search(r'/itm/(?:[^/?#]+/)?(\d+)', url or '')
+    return match.group(1) if match else None
+
+
+def to_timestamp(value):
+    """
+    Convert a datetime or epoch seconds to epoch seconds.
+
+    Args:
+        value (datetime or float): Point in time
+
+    Returns:
+        float: Epoch seconds
+    """
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+class PriceHistory:
+    """SQLite store of every price observation, written in batches off the scrape loop."""
+
+    def __init__(self, path=DEFAULT_HISTORY_DB, batch_size=100, flush_interval=2.0):
+        """
+        Initialize the store and start its background writer.
+
+        Args:
+            path (str): SQLite database file (default: browser_data/price_history.db)
+            batch_size (int): Observations written per transaction at most (default: 100)
+            flush_interval (float): Seconds the writer waits to fill a batch (default: 2.0)
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self.connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+
+        self.writer = threading.Thread(target=self.write_loop, daemon=True)
+        self.writer.start()
+
+    def connect(self):
+        """
+        Open a connection to the database.
+
+        Returns:
+            sqlite3.Connection: Connection with rows returned as sqlite3.Row
+        """
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def record_result(self, region, search_term, result, observed_at=None):
+        """
+        Queue every price in a scrape result for writing. Returns immediately.
+
+        Args:
+            region (str): eBay region searched
+            search_term (str): The product searched for
+            result (dict): Result from EbayScraper.scrape()
+            observed_at (float): Epoch seconds of the observation (default: now)
+        """
+        if not result:
+            return
+
+        observed_at = time.time() if observed_at is None else observed_at
+        term = normalize_term(search_term)
+
+        listings = []
+        if result.get('lowest'):
+            listings.append(('lowest', None, result['lowest']))
+        if result.get('your_store'):
+            listings.append(('your_store', result['your_store'].get('store'), result['your_store']))
+        for store, listing in (result.get('stores') or {}).items():
+            listings.append(('store', store, listing))
+
+        for role, store, listing in listings:
+            # Parse the text as displayed: the cleaned 'price' loses formats like '1.234,50 EUR'
+            price_text = listing.get('price_text') or listing.get('price')
+            price, currency = parse_price(price_text, region)
+            self.queue.put((
+                observed_at,
+                region,
+                term,
+                role,
+                store,
+                listing.get('listing_id') or listing_id_from_url(listing.get('url')),
+                listing.get('seller'),
+                listing.get('title'),
+                price,
+                price_text,
+                currency,
+                listing.get('url'),
+            ))
+
+    def write_loop(self):
+        """Background thread: write queued observations in batched transactions."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        insert = f"INSERT INTO observations ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+        stopping = False
+        while not stopping:
+            batch = []
+            item = self.queue.get()
+            deadline = time.time() + self.flush_interval
+            while True:
+                if item is None:
+                    stopping = True
+                else:
+                    batch.append(item)
+                if stopping or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get(timeout=max(0, deadline - time.time()))
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    with conn:
+                        conn.executemany(insert, batch)
+                except sqlite3.Error as e:
+                    print(f"⚠️  Could not write price history: {str(e)}")
+
+        conn.close()
+
+    def close(self):
+        """Write any queued observations and stop the background writer."""
+        if self.writer.is_alive():
+            self.queue.put(None)
+            self.writer.join()
+
+    def latest_price(self, search_term, region='UK', role='lowest'):
+        """
+        Get the most recent observation for a search term.
+
+        Args:
+            search_term (str): The product searched for
+            region (str): eBay region (default: 'UK')
+            role (str): 'lowest', 'your_store' or 'store' (default: 'lowest')
+
+        Returns:
+            dict: Latest observation, or None if the term was never recorded
+        """
+        with self.connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM observations WHERE term = ? AND region = ? AND role = ? "
+                "ORDER BY observed_at DESC LIMIT 1",
+                (normalize_term(search_term), region, role)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def price_window(self, search_term, start, end=None, region='UK', role='lowest'):
+        """
+        Get every observation for a search term within a time window.
+
+        Args:
+            search_term (str): The product searched for
+            start (datetime or float): Start of the window
+            end (datetime or float): End of the window (default: now)
+            region (str): eBay region (default: 'UK')
+            role (str): 'lowest', 'your_store' or 'store' (default: 'lowest')
+
+        Returns:
+            list: Observations as dicts, oldest first
+        """
+        end = time.time() if end is None else to_timestamp(end)
+        with self.connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM observations WHERE term = ? AND region = ? AND role = ? "
+                "AND observed_at BETWEEN ? AND ? ORDER BY observed_at",
+                (normalize_term(search_term), region, role, to_timestamp(start), end)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
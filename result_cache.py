@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Result cache for the eBay Price Scraper
+Keeps recent scrape results with a time-to-live, in memory and optionally on disk.
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+# Default on-disk location, next to the saved cookies
+DEFAULT_CACHE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'browser_data', 'result_cache.json'
+)
+
+
+class ResultCache:
+    """LRU cache of scrape results with a per-entry time-to-live."""
+
+    def __init__(self, ttl=300, max_entries=256, path=None):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl (float): Seconds an entry stays valid (default: 300)
+            max_entries (int): Entries kept before the least recently used is evicted (default: 256)
+            path (str): Optional JSON file to persist entries to; use DEFAULT_CACHE_FILE to keep
+                it next to browser_data/ (default: None, memory only)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        if self.path:
+            self.load()
+
+    @staticmethod
+    def make_key(region, search_term, store_names=(), mode=''):
+        """
+        Build the cache key for a scrape.
+
+        Args:
+            region (str): eBay region
+            search_term (str): The product searched for; case and extra whitespace are ignored
+            store_names (iterable): Store names requested; order and case are ignored
+            mode (str): Scraper options that change the result (see EbayScraper.cache_mode())
+
+        Returns:
+            str: Cache key
+        """
+        term = ' '.join(search_term.lower().split())
+        stores = sorted({name.strip().lower() for name in store_names if name and name.strip()})
+        return json.dumps([region.upper(), term, stores, mode], ensure_ascii=False)
+
+    def get(self, key):
+        """
+        Look up a cached result.
+
+        Args:
+            key (str): Key from make_key()
+
+        Returns:
+            dict: A copy of the cached result, or None if missing or expired
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            if entry['expires'] <= time.time():
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return copy.deepcopy(entry['result'])
+
+    def set(self, key, result, ttl=None):
+        """
+        Store a result.
+
+        Args:
+            key (str): Key from make_key()
+            result (dict): Scrape result to cache
+            ttl (float): Override the cache's time-to-live for this entry
+        """
+        with self.lock:
+            self.entries[key] = {
+                'result': copy.deepcopy(result),
+                'expires': time.time() + (self.ttl if ttl is None else ttl),
+            }
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+            if self.path:
+                self.save()
+
+    def clear(self):
+        """Remove every entry."""
+        with self.lock:
+            self.entries.clear()
+            if self.path:
+                self.save()
+
+    def load(self):
+        """Load unexpired entries from the cache file."""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not load result cache: {str(e)}")
+            return
+
+        now = time.time()
+        for key, entry in stored:
+            if entry['expires'] > now:
+                self.entries[key] = entry
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def save(self):
+        """Write the entries to the cache file (caller holds the lock)."""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(list(self.entries.items()), f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"⚠️  Could not save result cache: {str(e)}")
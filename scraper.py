@@ -4,11 +4,145 @@ eBay Price Scraper using Playwright
 This script searches for products on eBay and finds the lowest-priced item.
 """
 
+import json
+import os
 import sys
+import threading
 import time
 import re
+from urllib.parse import urlparse
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 
+from http_backend import HttpBackend, ChallengeDetected
+from price_history import parse_price, normalize_term
+from result_cache import ResultCache
+from timing import PhaseTimer, timed
+
+
+class ResourcePolicy:
+    """Decides which network requests a browser context should abort."""
+
+    # Resource types the price extraction never needs
+    BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font')
+
+    # Advertising, analytics and tracking hosts loaded by eBay pages
+    BLOCKED_DOMAINS = (
+        'doubleclick.net',
+        'googlesyndication.com',
+        'googletagmanager.com',
+        'google-analytics.com',
+        'googleadservices.com',
+        'ebayadservices.com',
+        'facebook.net',
+        'facebook.com',
+        'criteo.com',
+        'criteo.net',
+        'adnxs.com',
+        'rubiconproject.com',
+        'casalemedia.com',
+        'bidswitch.net',
+        'pinterest.com',
+        'bat.bing.com',
+        'rlcdn.com',
+        '1rx.io',
+        'unrulymedia.com',
+        'socdm.com',
+        'sc-static.net',
+        'scorecardresearch.com',
+        'redditstatic.com',
+    )
+
+    # Never blocked, so challenge pages and anything the extraction relies on still load
+    ALLOWED_URL_PATTERNS = ('captcha', '/splashui/')
+
+    def __init__(self, resource_types=None, domains=None, allowed_urls=None):
+        """
+        Initialize the policy.
+
+        Args:
+            resource_types (iterable): Resource types to block (default: BLOCKED_RESOURCE_TYPES)
+            domains (iterable): Hosts to block, including their subdomains (default: BLOCKED_DOMAINS)
+            allowed_urls (iterable): URL substrings that are never blocked (default: ALLOWED_URL_PATTERNS)
+        """
+        self.resource_types = set(self.BLOCKED_RESOURCE_TYPES if resource_types is None else resource_types)
+        self.domains = tuple(self.BLOCKED_DOMAINS if domains is None else domains)
+        self.allowed_urls = tuple(self.ALLOWED_URL_PATTERNS if allowed_urls is None else allowed_urls)
+
+    def should_block(self, url, resource_type):
+        """
+        Check whether a request should be aborted.
+
+        Args:
+            url (str): Request URL
+            resource_type (str): Playwright resource type ('document', 'image', 'script', ...)
+
+        Returns:
+            bool: True if the request should be aborted
+        """
+        if any(pattern in url for pattern in self.allowed_urls):
+            return False
+        if resource_type in self.resource_types:
+            return True
+
+        host = urlparse(url).hostname or ''
+        return any(host == domain or host.endswith('.' + domain) for domain in self.domains)
+
+    def handle_route(self, route):
+        """Route handler for context.route(): abort blocked requests, continue the rest."""
+        request = route.request
+        if self.should_block(request.url, request.resource_type):
+            route.abort()
+        else:
+            route.continue_()
+
+
+class StoreMatcher:
+    """Finds any number of store names in listing data with one precompiled pattern."""
+
+    def __init__(self, store_names):
+        """
+        Initialize the matcher.
+
+        Args:
+            store_names (iterable): Store names to look for (matched case-insensitively)
+        """
+        self.names = {}
+        for name in store_names:
+            if name and name.strip():
+                self.names.setdefault(name.strip().lower(), name.strip())
+
+        # Longest names first so a store is not shadowed by a shorter name sharing its prefix;
+        # the lookahead lets matches that start at different positions overlap
+        alternatives = '|'.join(re.escape(name) for name in sorted(self.names, key=len, reverse=True))
+        self.pattern = re.compile(f'(?=({alternatives}))') if alternatives else None
+
+    def match(self, listings):
+        """
+        Find each store's best listing in a single pass over the listings.
+
+        The listings are in price-sorted order, so the first listing that mentions a store
+        is that store's cheapest one.
+
+        Args:
+            listings (list): Listing dicts from EbayScraper.extract_listings()
+
+        Returns:
+            dict: Store name -> the store's cheapest listing, for every store that was found
+        """
+        found = {}
+        if not self.pattern:
+            return found
+
+        for listing in listings:
+            for match in self.pattern.finditer(listing['match_text']):
+                name = self.names[match.group(1)]
+                if name not in found:
+                    found[name] = listing
+            if len(found) == len(self.names):
+                break
+
+        return found
+
 
 class EbayScraper:
     """eBay web scraper for finding the lowest-priced products."""
@@ -23,55 +157,412 @@ class EbayScraper:
         'CA': 'https://www.ebay.ca',
     }
 
-    def __init__(self, headless=False, region='UK'):
+    # Geolocation and locale for each region
+    GEOLOCATION_SETTINGS = {
+        'UK': {'latitude': 51.5074, 'longitude': -0.1278, 'locale': 'en-GB'},  # London
+        'US': {'latitude': 37.7749, 'longitude': -122.4194, 'locale': 'en-US'},  # San Francisco
+        'DE': {'latitude': 52.5200, 'longitude': 13.4050, 'locale': 'de-DE'},  # Berlin
+        'FR': {'latitude': 48.8566, 'longitude': 2.3522, 'locale': 'fr-FR'},  # Paris
+        'AU': {'latitude': -33.8688, 'longitude': 151.2093, 'locale': 'en-AU'},  # Sydney
+        'CA': {'latitude': 43.6532, 'longitude': -79.3832, 'locale': 'en-CA'},  # Toronto
+    }
+
+    # Delivery postcode for each region
+    REGION_POSTCODES = {
+        'UK': 'SW1A 1AA',  # London postcode
+        'US': '10001',  # New York ZIP
+        'DE': '10115',  # Berlin postcode
+        'FR': '75001',  # Paris postcode
+        'AU': '2000',  # Sydney postcode
+        'CA': 'M5H 2N2',  # Toronto postcode
+    }
+
+    # Common eBay cookie consent button selectors
+    COOKIE_SELECTORS = [
+        'button#gdpr-banner-accept',
+        'button[id*="accept"]',
+        'button[class*="gdpr-banner-accept"]',
+        '#gdpr-banner-accept'
+    ]
+
+    # User agent of every browser context (and of the HTTP backend's requests)
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+    # Cookies that show the consent banner was already accepted: (name, fragment of the value)
+    CONSENT_COOKIES = [
+        ('dp1', 'bpbf'),
+    ]
+
+    # Clickable title link inside a result card
+    LINK_SELECTORS = [
+        'a.s-card__link[href*="/itm/"]',
+        'a.s-item__link'
+    ]
+
+    # Title text inside a result card's link
+    TITLE_SELECTOR = '.su-styled-text, .s-card__title, .s-item__title'
+
+    # Price on a product page
+    PRICE_SELECTORS = [
+        '.x-bin-price__content .x-price-primary span.ux-textspans',
+        '.x-price-primary span.ux-textspans',
+        '.x-price-primary span',
+        '#prcIsum'
+    ]
+
+    # Result cards on a search results page
+    LISTING_SELECTOR = 'li.s-card, .s-item'
+
+    # Card-level selectors used by the in-page listing extraction
+    CARD_SELECTOR = 'li.s-card, li.s-item'
+    CARD_PRICE_SELECTOR = '.s-card__price, .s-item__price'
+    CARD_SHIPPING_SELECTOR = '.s-item__shipping, .s-item__logisticsCost, .s-card__shipping'
+    CARD_SELLER_SELECTOR = '.s-item__seller-info-text, .s-card__seller-info, [class*="seller-info"]'
+
+    # Selectors handed to the in-page extraction script
+    LISTING_FIELD_SELECTORS = {
+        'cards': CARD_SELECTOR,
+        'links': ', '.join(LINK_SELECTORS),
+        'title': TITLE_SELECTOR,
+        'price': CARD_PRICE_SELECTOR,
+        'shipping': CARD_SHIPPING_SELECTOR,
+        'seller': CARD_SELLER_SELECTOR,
+    }
+
+    # Reads every result card in a single page.evaluate() call
+    EXTRACT_LISTINGS_JS = """
+        (sel) => {
+            const text = (el) => (el && el.textContent ? el.textContent.trim() : '');
+            const listings = [];
+            document.querySelectorAll(sel.cards).forEach((card) => {
+                const link = card.querySelector(sel.links);
+                const iid = (card.getAttribute('data-view') || '').match(/iid:(\\d+)/);
+                // Cards with neither an iid nor a listing ID are placeholders like the hidden
+                // "Shop on eBay" card, not results
+                if (!link || (!iid && !card.getAttribute('data-listingid'))) {
+                    return;
+                }
+                const titleElem = link.querySelector(sel.title);
+                let shipping = text(card.querySelector(sel.shipping));
+                if (!shipping) {
+                    const row = Array.from(card.querySelectorAll('span, div'))
+                        .find((el) => el.children.length === 0 && /postage|shipping|delivery/i.test(el.textContent));
+                    shipping = text(row);
+                }
+                const hrefs = Array.from(card.querySelectorAll('a[href]')).map((a) => a.href).join(' ');
+                listings.push({
+                    listing_id: card.getAttribute('data-listingid'),
+                    title: titleElem ? text(titleElem) : text(link).slice(0, 100),
+                    price: text(card.querySelector(sel.price)),
+                    shipping: shipping,
+                    seller: text(card.querySelector(sel.seller)),
+                    position: iid ? parseInt(iid[1], 10) : null,
+                    url: link.href,
+                    match_text: (card.innerText + ' ' + hrefs).toLowerCase(),
+                });
+            });
+            // Cards without an iid rank after every card that has one, in page order
+            let position = Math.max(0, ...listings.map((listing) => listing.position || 0));
+            listings.forEach((listing) => {
+                if (listing.position === null) {
+                    listing.position = ++position;
+                }
+            });
+            return listings;
+        }
+    """
+
+    # Search box on the homepage
+    SEARCH_BOX_SELECTORS = [
+        'input[type="text"][placeholder*="Search"]',
+        'input[name="__nkw"]',
+        'input#gh-ac',
+        'input[placeholder="Search for anything"]'
+    ]
+    SEARCH_BUTTON_SELECTORS = [
+        'input[type="submit"][value="Search"]',
+        'button[type="submit"]',
+        'input#gh-btn',
+        'input.btn-prim'
+    ]
+    NO_RESULTS_SELECTORS = [
+        'text="No exact matches found"',
+        'text="0 results"',
+        '.srp-save-null-search',
+        'text="No results found"'
+    ]
+
+    # Selector lists whose candidates are interchangeable, so a SelectorOrder may reorder them;
+    # the cookie and price lists are in order of preference and always keep it
+    ADAPTIVE_SELECTOR_STEPS = ('search_box', 'search_button', 'no_results')
+
+    # Wait strategies: 'demo' keeps fixed pauses so a visible run can be followed,
+    # 'fast' waits only for the page conditions the next step depends on
+    WAIT_PROFILES = ('demo', 'fast')
+
+    # Where search results come from: 'browser' loads them in Chromium, 'http' fetches and
+    # parses the HTML directly and falls back to the browser on a challenge page
+    BACKENDS = ('browser', 'http')
+
+    # HAR modes: 'record' saves every request of a scrape, 'replay' serves them back from the saved file
+    HAR_MODES = ('record', 'replay')
+
+    # How many result-card prices are confirmed on their product pages
+    VERIFY_MODES = ('none', 'top1', 'topK')
+
+    # Server-side search filters
+    ITEMS_PER_PAGE = (60, 120, 240)
+    CONDITION_CODES = {
+        'new': '1000',
+        'open_box': '1500',
+        'refurbished': '2500',
+        'used': '3000',
+        'for_parts': '7000',
+    }
+    LOCATION_CODES = {
+        'domestic': '1',    # Ships from the region's own country
+        'worldwide': '2',
+        'continent': '3',   # e.g. Europe on eBay UK/DE/FR, North America on eBay US/CA
+    }
+
+    # A price range shown for listings with variations ('£5.00 to £20.00', '5,00 EUR bis 9,00 EUR')
+    PRICE_RANGE_PATTERN = re.compile(r'\d\D{0,6}?\s*(?:\bto\b|\bbis\b|\bà\b|-|–)\s*\D{0,6}\d', re.IGNORECASE)
+
+    def __init__(self, headless=False, region='UK', direct_search=False, pool=None, wait_profile=None,
+                 block_resources=None, resource_policy=None, cache=None, history=None,
+                 verify='top1', verify_k=3, verify_tabs=4,
+                 items_per_page=None, buy_it_now=False, condition=None, location=None, timing_log=None,
+                 metrics=None, selector_stats=None, selector_order=None, backend='browser', http_backend=None,
+                 base_url=None, har_mode=None, har_dir=None):
         """
         Initialize the scraper.
 
         Args:
             headless (bool): Whether to run browser in headless mode (default: False for visible browser)
             region (str): eBay region to search (default: 'UK')
+            direct_search (bool): Navigate straight to the price-sorted results URL instead of
+                typing into the homepage search box and re-sorting (default: False)
+            pool (BrowserPool): Optional warm browser pool to borrow a context from instead of
+                launching a new browser for every scrape (default: None)
+            wait_profile (str): 'demo' for fixed pauses or 'fast' for event-driven readiness
+                waits (default: 'fast' when headless, 'demo' otherwise)
+            block_resources (bool): Abort images, fonts, media and tracker requests
+                (default: True when headless, False otherwise)
+            resource_policy (ResourcePolicy): What to block when blocking is on (default: ResourcePolicy())
+            cache (ResultCache): Optional cache of recent results checked before scraping (default: None)
+            history (PriceHistory): Optional store that records every scraped price (default: None)
+            verify (str): 'none' takes prices from the sorted result cards without opening product
+                pages, 'top1' confirms the first listing's price on its product page, 'topK' confirms
+                the first verify_k listings and keeps the cheapest (default: 'top1')
+            verify_k (int): Number of listings confirmed by verify='topK' (default: 3)
+            verify_tabs (int): Maximum product pages loaded at the same time (default: 4)
+            items_per_page (int): Listings per results page, 60, 120 or 240 (_ipg; default: eBay's)
+            buy_it_now (bool): Only Buy It Now listings (LH_BIN; default: False)
+            condition (str or list): Item condition(s) from CONDITION_CODES, e.g. 'new'
+                (LH_ItemCondition; default: any)
+            location (str): Where items ship from, a key of LOCATION_CODES (LH_PrefLoc; default: any)
+            timing_log (TimingLog): Optional log that receives the phase timings of every scrape
+                (default: None)
+            metrics (ScraperMetrics): Optional counters and histograms updated by every scrape
+                (default: None)
+            selector_stats (SelectorStats): Optional record of the time every selector candidate
+                takes to match or fail (default: None)
+            selector_order (SelectorOrder): Optional hit table that tries the candidate that won
+                last in this region first (default: None, fixed order)
+            backend (str): 'browser' loads the search results in Chromium, 'http' fetches the
+                sorted results page over HTTP and only starts a browser for product pages or
+                when eBay answers with a challenge (default: 'browser')
+            http_backend (HttpBackend): HTTP client to share between scrapers when backend='http'
+                (default: a new one)
+            base_url (str): Site to scrape instead of the region's eBay domain, e.g. a
+                FixtureServer's base_url(region) for offline runs (default: None)
+            har_mode (str): 'record' saves each scrape's traffic to a HAR file per region and
+                search term, 'replay' serves every request from that file instead of the network
+                (default: None)
+            har_dir (str): Directory of the HAR files (default: browser_data/har)
         """
         self.headless = headless
         self.region = region
-        self.ebay_url = self.EBAY_REGIONS.get(region, self.EBAY_REGIONS['UK'])
+        self.direct_search = direct_search
+        self.pool = pool
+        if wait_profile is None:
+            wait_profile = 'fast' if headless else 'demo'
+        if wait_profile not in self.WAIT_PROFILES:
+            raise ValueError(f"Unknown wait profile '{wait_profile}', expected one of {self.WAIT_PROFILES}")
+        self.wait_profile = wait_profile
+        if block_resources is None:
+            block_resources = headless
+        self.resource_policy = (resource_policy or ResourcePolicy()) if block_resources else None
+        self.cache = cache
+        self.history = history
+        if verify not in self.VERIFY_MODES:
+            raise ValueError(f"Unknown verify mode '{verify}', expected one of {self.VERIFY_MODES}")
+        self.verify = verify
+        self.verify_k = max(1, verify_k)
+        self.verify_tabs = max(1, verify_tabs)
+
+        if items_per_page is not None and items_per_page not in self.ITEMS_PER_PAGE:
+            raise ValueError(f"items_per_page must be one of {self.ITEMS_PER_PAGE}")
+        conditions = [condition] if isinstance(condition, str) else list(condition or [])
+        for name in conditions:
+            if name not in self.CONDITION_CODES:
+                raise ValueError(f"Unknown condition '{name}', expected one of {tuple(self.CONDITION_CODES)}")
+        if location is not None and location not in self.LOCATION_CODES:
+            raise ValueError(f"Unknown location '{location}', expected one of {tuple(self.LOCATION_CODES)}")
+        self.items_per_page = items_per_page
+        self.buy_it_now = buy_it_now
+        self.conditions = conditions
+        self.location = location
+        self.timer = PhaseTimer()
+        self.timing_log = timing_log
+        self.metrics = metrics
+        self.selector_stats = selector_stats
+        self.selector_order = selector_order
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {self.BACKENDS}")
+        self.backend = backend
+        self.http_backend = (http_backend or HttpBackend()) if backend == 'http' else None
+        if har_mode is not None and har_mode not in self.HAR_MODES:
+            raise ValueError(f"Unknown HAR mode '{har_mode}', expected one of {self.HAR_MODES}")
+        if har_mode and pool:
+            raise ValueError("HAR modes need a context per scrape and can't be used with a browser pool")
+        self.har_mode = har_mode
+        self.har_dir = har_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'browser_data', 'har')
+        self.har_term = None
+        # Per-context warm-up already done: consent banner handled, delivery location stored
+        self.warm = {'consent': False, 'location': False}
+        # Whether the last search failed because eBay showed its no-results banner
+        self.no_results_found = False
+        self.base_url = base_url
+        self.ebay_url = base_url.rstrip('/') if base_url else self.EBAY_REGIONS.get(region, self.EBAY_REGIONS['UK'])
         self.browser = None
         self.page = None
         self.playwright = None
         self.context = None
 
-    def start(self):
-        """Start the browser and create a new page."""
-        import os
+    def start(self, search_term=None):
+        """
+        Start the browser and create a new page.
+
+        Args:
+            search_term (str): The product about to be searched; names the HAR file when
+                recording or replaying (default: None)
+        """
+        self.har_term = search_term
         print("🚀 Launching browser...")
-        self.playwright = sync_playwright().start()
-
-        # Launch browser in headed mode with a reasonable viewport size
-        self.browser = self.playwright.chromium.launch(
-            headless=self.headless,
-            args=['--start-maximized']  # Start browser maximized
-        )
-
-        # Set geolocation and locale based on region
-        geolocation_settings = {
-            'UK': {'latitude': 51.5074, 'longitude': -0.1278, 'locale': 'en-GB'},  # London
-            'US': {'latitude': 37.7749, 'longitude': -122.4194, 'locale': 'en-US'},  # San Francisco
-            'DE': {'latitude': 52.5200, 'longitude': 13.4050, 'locale': 'de-DE'},  # Berlin
-            'FR': {'latitude': 48.8566, 'longitude': 2.3522, 'locale': 'fr-FR'},  # Paris
-            'AU': {'latitude': -33.8688, 'longitude': 151.2093, 'locale': 'en-AU'},  # Sydney
-            'CA': {'latitude': 43.6532, 'longitude': -79.3832, 'locale': 'en-CA'},  # Toronto
-        }
+        with self.timer.span('launch'):
+            self.playwright = sync_playwright().start()
 
-        region_settings = geolocation_settings.get(self.region, geolocation_settings['UK'])
+            # Launch browser in headed mode with a reasonable viewport size
+            self.browser = self.playwright.chromium.launch(
+                headless=self.headless,
+                args=['--start-maximized']  # Start browser maximized
+            )
 
-        # Path to store cookies
+        with self.timer.span('context'):
+            self.context = self.new_context(self.browser)
+            self.page = self.context.new_page()
+        self.warm = self.saved_warm_state()
+
+        print(f"✅ Browser launched successfully (Location: {self.region})\n")
+
+    def saved_warm_state(self):
+        """
+        Check the saved storage state for warm-up a new context can skip.
+
+        Returns:
+            dict: 'consent' if a consent cookie for this site is saved, 'location' if the
+                region's delivery location is already in localStorage
+        """
+        warm = {'consent': False, 'location': False}
+        cookies_file = getattr(self, 'cookies_file', None) or self.get_cookies_file()
+        if self.har_mode == 'replay' or not os.path.exists(cookies_file):
+            return warm
+
+        try:
+            with open(cookies_file, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return warm
+
+        parsed = urlparse(self.ebay_url)
+        host = parsed.hostname or ''
+        for cookie in state.get('cookies', []):
+            domain = cookie.get('domain', '').lstrip('.')
+            if not (host == domain or host.endswith('.' + domain)):
+                continue
+            for name, fragment in self.CONSENT_COOKIES:
+                if cookie.get('name') == name and fragment in cookie.get('value', ''):
+                    warm['consent'] = True
+
+        postcode = self.REGION_POSTCODES.get(self.region, self.REGION_POSTCODES['UK'])
+        for origin in state.get('origins', []):
+            if origin.get('origin') != f'{parsed.scheme}://{parsed.netloc}':
+                continue
+            storage = {item['name']: item['value'] for item in origin.get('localStorage', [])}
+            if storage.get('ebay_postcode') == postcode and storage.get('ebay_country') == self.region:
+                warm['location'] = True
+
+        return warm
+
+    def get_har_file(self):
+        """
+        Get the path of the HAR file for the current region and search term.
+
+        Returns:
+            str: Path like browser_data/har/uk/iphone-15-pro.har
+        """
+        slug = re.sub(r'[^a-z0-9]+', '-', normalize_term(self.har_term or 'session')).strip('-') or 'session'
+        return os.path.join(self.har_dir, self.region.lower(), f'{slug}.har')
+
+    def get_cookies_file(self):
+        """
+        Get the path of the saved storage state for the current region.
+
+        A base_url override gets a file of its own per host, so offline runs never touch the
+        real site's cookies.
+
+        Returns:
+            str: Path to the region's cookies file inside browser_data/
+        """
         cookies_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'browser_data')
         os.makedirs(cookies_dir, exist_ok=True)
-        cookies_file = os.path.join(cookies_dir, f'ebay_{self.region.lower()}_cookies.json')
+        if self.base_url:
+            host = re.sub(r'[^a-z0-9]+', '-', (urlparse(self.ebay_url).hostname or 'local').lower()).strip('-')
+            return os.path.join(cookies_dir, f'ebay_{self.region.lower()}_{host}_cookies.json')
+        return os.path.join(cookies_dir, f'ebay_{self.region.lower()}_cookies.json')
+
+    @staticmethod
+    def write_storage_state(state, path):
+        """
+        Write a context's storage state through a temporary file, so contexts saving the
+        same file at once can't leave it half written.
+
+        Args:
+            state (dict): Storage state returned by context.storage_state()
+            path (str): File to write
+        """
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, path)
+
+    def context_options(self):
+        """
+        Build the browser context options for the current region.
+
+        Returns:
+            dict: Keyword arguments for browser.new_context()
+        """
+        region_settings = self.GEOLOCATION_SETTINGS.get(self.region, self.GEOLOCATION_SETTINGS['UK'])
+
+        # Path to store cookies
+        cookies_file = self.get_cookies_file()
 
         # Create a new browser context with custom settings
         context_options = {
             'viewport': {'width': 1280, 'height': 720},
-            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'user_agent': self.USER_AGENT,
             'locale': region_settings['locale'],
             'geolocation': {
                 'latitude': region_settings['latitude'],
@@ -85,70 +576,286 @@ class EbayScraper:
             print(f"📂 Loading saved cookies for {self.region}...")
             context_options['storage_state'] = cookies_file
 
-        self.context = self.browser.new_context(**context_options)
-        self.page = self.context.new_page()
+        if self.har_mode == 'record':
+            har_path = self.get_har_file()
+            os.makedirs(os.path.dirname(har_path), exist_ok=True)
+            print(f"📼 Recording traffic to {har_path}")
+            context_options['record_har_path'] = har_path
+            context_options['record_har_mode'] = 'full'
+
         self.cookies_file = cookies_file
+        return context_options
 
-        print(f"✅ Browser launched successfully (Location: {self.region})\n")
+    def new_context(self, browser):
+        """
+        Create a browser context configured for the current region.
+
+        Args:
+            browser: Playwright browser to create the context in
+
+        Returns:
+            BrowserContext: New context with locale, geolocation and saved cookies applied
+        """
+        context = browser.new_context(**self.context_options())
+        if self.resource_policy:
+            context.route('**/*', self.resource_policy.handle_route)
+        if self.har_mode == 'replay':
+            har_path = self.get_har_file()
+            if not os.path.exists(har_path):
+                context.close()
+                raise FileNotFoundError(f"No recorded HAR for \"{self.har_term}\" ({self.region}): {har_path}")
+            print(f"📼 Replaying traffic from {har_path}")
+            # Requests missing from the recording fail instead of reaching the network
+            context.route_from_har(har_path, not_found='abort')
+        if self.metrics:
+            context.on('requestfinished', self.count_request)
+        return context
+
+    def count_request(self, request):
+        """Request listener: count the bytes downloaded into the metrics."""
+        self.metrics.record_request(self.region, request)
+
+    def record_timeout(self, step):
+        """
+        Count a Playwright timeout in the metrics, if any.
+
+        Args:
+            step (str): Step that timed out, e.g. 'search'
+        """
+        if self.metrics:
+            self.metrics.record_timeout(self.region, step)
+
+    def record_selector(self, step, selector, index, elapsed, won):
+        """
+        Record one try of a selector candidate in the selector stats and metrics, if any.
+
+        Args:
+            step (str): Selector list the candidate belongs to, e.g. 'price'
+            selector (str): The candidate
+            index (int): Position of the candidate in its default list
+            elapsed (float): Seconds the try took
+            won (bool): Whether the candidate matched
+        """
+        if self.selector_stats:
+            self.selector_stats.record(self.region, step, selector, elapsed, won)
+        if self.selector_order and step in self.ADAPTIVE_SELECTOR_STEPS:
+            self.selector_order.record(self.region, step, selector, won)
+        if self.metrics and won:
+            self.metrics.record_fallback(self.region, step, index)
+
+    def ordered_selectors(self, step, selectors):
+        """
+        Put selector candidates in the order they should be tried.
+
+        Args:
+            step (str): Name of the selector list
+            selectors (list): Candidates in their default order
+
+        Returns:
+            list: Candidates, learned winner first when a selector order is set and the list is
+                one of ADAPTIVE_SELECTOR_STEPS, otherwise in their default order
+        """
+        if self.selector_order and step in self.ADAPTIVE_SELECTOR_STEPS:
+            return self.selector_order.order(self.region, step, selectors)
+        return list(selectors)
+
+    def find_visible(self, step, selectors, timeout, page=None):
+        """
+        Try selector candidates in turn and return the first one that is visible.
+
+        Args:
+            step (str): Name of the selector list, for the selector stats and metrics
+            selectors (list): Candidates in their default order
+            timeout (int): Milliseconds allowed per candidate
+            page: Page to look on (default: the scraper's main page)
+
+        Returns:
+            str: The visible selector, or None if none is
+        """
+        page = page or self.page
+        for selector in self.ordered_selectors(step, selectors):
+            started = time.perf_counter()
+            try:
+                visible = page.locator(selector).is_visible(timeout=timeout)
+            except Exception:
+                visible = False
+            self.record_selector(step, selector, selectors.index(selector), time.perf_counter() - started, visible)
+            if visible:
+                return selector
+        return None
+
+    @staticmethod
+    def combined_locator(page, selectors):
+        """
+        Build one locator that matches a visible element of any of the selectors.
+
+        Hidden matches are filtered out per candidate, so waiting on .first can't get stuck on
+        a hidden element that comes first in the page (e.g. a duplicated price span) while
+        another candidate is visible. Works with sync and async pages alike, since building a
+        locator doesn't wait.
+
+        Args:
+            page: Page to look on
+            selectors (list): Candidate selectors (CSS or Playwright text selectors)
+
+        Returns:
+            Locator: Locator matching the visible elements of the union of the candidates
+        """
+        combined = EbayScraper.visible_locator(page, selectors[0])
+        for selector in selectors[1:]:
+            combined = combined.or_(EbayScraper.visible_locator(page, selector))
+        return combined
+
+    @staticmethod
+    def visible_locator(page, selector):
+        """
+        Build a locator for the visible elements a selector matches.
+
+        Args:
+            page: Page to look on
+            selector (str): CSS or Playwright text selector
+
+        Returns:
+            Locator: Locator that skips hidden matches
+        """
+        return page.locator(f'{selector} >> visible=true')
+
+    def race_visible(self, step, selectors, timeout, page=None, accept=None):
+        """
+        Wait once for whichever selector candidate becomes visible first.
+
+        All candidates are awaited together through one combined locator, so a miss costs
+        one timeout rather than one per candidate. Once something is visible, the visible
+        candidates are checked in preference order and the first whose text is accepted wins.
+
+        Args:
+            step (str): Name of the selector list, for the selector stats and metrics
+            selectors (list): Candidates in order of preference
+            timeout (int): Milliseconds to wait for any candidate
+            page: Page to look on (default: the scraper's main page)
+            accept (callable): Optional check of the winner's text, e.g. that it parses as a price
+
+        Returns:
+            tuple: (winning selector, its text), or (None, None) if nothing matched
+        """
+        page = page or self.page
+        candidates = self.ordered_selectors(step, selectors)
+        started = time.perf_counter()
+        try:
+            self.combined_locator(page, candidates).first.wait_for(state='visible', timeout=timeout)
+        except PlaywrightTimeoutError:
+            self.record_timeout(step)
+            # The single wait was spent on all of them
+            elapsed = (time.perf_counter() - started) / len(candidates)
+            for selector in candidates:
+                self.record_selector(step, selector, selectors.index(selector), elapsed, False)
+            return None, None
+
+        for selector in candidates:
+            try:
+                element = self.visible_locator(page, selector).first
+                text = element.text_content().strip() if element.is_visible() else None
+            except Exception:
+                text = None
+            won = bool(text) and (accept is None or bool(accept(text)))
+            elapsed = time.perf_counter() - started if won else 0.0
+            self.record_selector(step, selector, selectors.index(selector), elapsed, won)
+            if won:
+                return selector, text
+
+        return None, None
 
     def close(self):
         """Close the browser and cleanup resources."""
-        # Save cookies before closing
-        if self.context and hasattr(self, 'cookies_file'):
+        # Save cookies before closing (not when replaying, the recorded cookies aren't current)
+        if self.context and hasattr(self, 'cookies_file') and self.har_mode != 'replay':
             try:
                 print("💾 Saving cookies for next session...")
-                self.context.storage_state(path=self.cookies_file)
+                with self.timer.span('save_state'):
+                    self.write_storage_state(self.context.storage_state(), self.cookies_file)
                 print(f"✅ Cookies saved to {self.cookies_file}")
             except Exception as e:
                 print(f"⚠️  Could not save cookies: {str(e)}")
 
+        if self.context and self.har_mode == 'record':
+            # The HAR file is written when its context closes
+            self.context.close()
+            print(f"📼 Saved {self.get_har_file()}")
+
         if self.browser:
             print("\n🔒 Closing browser...")
             self.browser.close()
         if self.playwright:
             self.playwright.stop()
 
+    def pause(self, seconds):
+        """
+        Pause for a fixed time in the demo profile; does nothing in the fast profile.
+
+        Args:
+            seconds (float): How long to pause
+        """
+        if self.wait_profile == 'demo':
+            time.sleep(seconds)
+
+    def wait_until_ready(self, selector, demo_seconds, state='visible', timeout=10000, page=None):
+        """
+        Wait until the page is ready for the next step.
+
+        The demo profile sleeps for a fixed time; the fast profile waits for the selector
+        to reach the given state and returns as soon as it does.
+
+        Args:
+            selector (str): Element the next step needs
+            demo_seconds (float): Fixed pause used by the demo profile
+            state (str): Element state to wait for in the fast profile (default: 'visible')
+            timeout (int): Maximum wait in milliseconds for the fast profile (default: 10000)
+            page: Page to wait on (default: the scraper's main page)
+
+        Returns:
+            bool: False if the fast profile timed out, True otherwise
+        """
+        if self.wait_profile == 'demo':
+            time.sleep(demo_seconds)
+            return True
+
+        try:
+            (page or self.page).wait_for_selector(selector, state=state, timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            self.record_timeout('wait')
+            print(f"⚠️  Timed out waiting for {selector}, but continuing...")
+            return False
+
+    @timed('cookie_consent')
     def handle_cookie_consent(self):
-        """Handle cookie consent popup if it appears."""
+        """Handle cookie consent popup if it appears, once per browser context."""
+        if self.warm['consent']:
+            return
+
         try:
             # Wait for cookie consent button (with short timeout)
-            # Common eBay cookie consent button selectors
-            cookie_selectors = [
-                'button#gdpr-banner-accept',
-                'button[id*="accept"]',
-                'button[class*="gdpr-banner-accept"]',
-                '#gdpr-banner-accept'
-            ]
-
-            for selector in cookie_selectors:
-                try:
-                    if self.page.locator(selector).is_visible(timeout=2000):
-                        print("🍪 Accepting cookie consent...")
-                        self.page.click(selector, timeout=2000)
-                        time.sleep(1)
-                        print("✅ Cookie consent accepted\n")
-                        return
-                except:
-                    continue
+            selector = self.find_visible('cookie_consent', self.COOKIE_SELECTORS, timeout=2000)
+            if selector:
+                print("🍪 Accepting cookie consent...")
+                self.page.click(selector, timeout=2000)
+                self.pause(1)
+                print("✅ Cookie consent accepted\n")
+            # Accepted, or no banner in this context: don't probe again
+            self.warm['consent'] = True
 
         except Exception as e:
             # If no cookie popup found, continue silently
             pass
 
+    @timed('location')
     def set_delivery_location(self):
-        """Set the delivery location based on the region."""
+        """Set the delivery location based on the region, once per browser context."""
+        if self.warm['location']:
+            return True
+
         try:
-            # For UK, set a UK postcode
-            region_postcodes = {
-                'UK': 'SW1A 1AA',  # London postcode
-                'US': '10001',  # New York ZIP
-                'DE': '10115',  # Berlin postcode
-                'FR': '75001',  # Paris postcode
-                'AU': '2000',  # Sydney postcode
-                'CA': 'M5H 2N2',  # Toronto postcode
-            }
-
-            postcode = region_postcodes.get(self.region, region_postcodes['UK'])
+            postcode = self.REGION_POSTCODES.get(self.region, self.REGION_POSTCODES['UK'])
 
             print(f"📍 Setting delivery location to {self.region} ({postcode})...")
 
@@ -160,12 +867,14 @@ class EbayScraper:
             """)
 
             print(f"✅ Delivery location set to {self.region}\n")
+            self.warm['location'] = True
             return True
 
         except Exception as e:
             print(f"⚠️  Could not set delivery location: {str(e)}")
             return False
 
+    @timed('search')
     def search_product(self, search_term):
         """
         Search for a product on eBay.
@@ -182,7 +891,8 @@ class EbayScraper:
             # Navigate to eBay homepage
             print(f"📡 Navigating to {self.ebay_url}...")
             self.page.goto(self.ebay_url, timeout=30000)
-            time.sleep(2)  # Wait to see the homepage
+            # Wait to see the homepage / for the search box to render
+            self.wait_until_ready(', '.join(self.SEARCH_BOX_SELECTORS), 2)
 
             # Handle cookie consent if present
             self.handle_cookie_consent()
@@ -191,21 +901,7 @@ class EbayScraper:
             self.set_delivery_location()
 
             # Find the search bar (eBay uses input with type="text" and various possible selectors)
-            search_selectors = [
-                'input[type="text"][placeholder*="Search"]',
-                'input[name="__nkw"]',
-                'input#gh-ac',
-                'input[placeholder="Search for anything"]'
-            ]
-
-            search_box = None
-            for selector in search_selectors:
-                try:
-                    if self.page.locator(selector).is_visible(timeout=3000):
-                        search_box = selector
-                        break
-                except:
-                    continue
+            search_box = self.find_visible('search_box', self.SEARCH_BOX_SELECTORS, timeout=3000)
 
             if not search_box:
                 print("❌ Error: Could not find search box")
@@ -214,24 +910,10 @@ class EbayScraper:
             # Fill in the search term
             print(f"⌨️  Typing search term: \"{search_term}\"...")
             self.page.fill(search_box, search_term)
-            time.sleep(1)  # Wait to see the typing
+            self.pause(1)  # Wait to see the typing
 
             # Submit the search (look for search button)
-            search_button_selectors = [
-                'input[type="submit"][value="Search"]',
-                'button[type="submit"]',
-                'input#gh-btn',
-                'input.btn-prim'
-            ]
-
-            search_button = None
-            for selector in search_button_selectors:
-                try:
-                    if self.page.locator(selector).is_visible(timeout=2000):
-                        search_button = selector
-                        break
-                except:
-                    continue
+            search_button = self.find_visible('search_button', self.SEARCH_BUTTON_SELECTORS, timeout=2000)
 
             if search_button:
                 print("🔍 Submitting search...")
@@ -250,58 +932,146 @@ class EbayScraper:
             except:
                 print("⚠️  Page still loading, but continuing...")
 
-            time.sleep(3)  # Give it extra time to fully load
+            # Give it extra time to fully load / wait for listings or the no-results banner
+            self.wait_until_ready(f'{self.LISTING_SELECTOR}, .srp-save-null-search', 3, state='attached')
 
-            # Debug: Print current URL to see where we are
-            current_url = self.page.url
-            print(f"📍 Current URL: {current_url}")
+            return self._verify_search_results(search_term)
 
-            # Check if we have results
-            no_results_selectors = [
-                'text="No exact matches found"',
-                'text="0 results"',
-                '.srp-save-null-search',
-                'text="No results found"'
-            ]
+        except PlaywrightTimeoutError:
+            self.record_timeout('search')
+            print("❌ Error: Timeout while searching. eBay might be slow or unreachable.")
+            return False
+        except Exception as e:
+            print(f"❌ Error during search: {str(e)}")
+            return False
 
-            for selector in no_results_selectors:
-                try:
-                    if self.page.locator(selector).is_visible(timeout=1000):
-                        print(f"❌ No results found for \"{search_term}\"")
-                        return False
-                except:
-                    continue
+    def build_search_url(self, search_term, page_number=1):
+        """
+        Build the price-sorted search results URL for the current region.
 
-            # Verify we actually have product listings
-            try:
-                # Wait a bit for products to appear
-                print("🔍 Waiting for product listings to appear...")
-                self.page.wait_for_selector('li.s-card, .s-item', timeout=10000)
-                products = self.page.locator('li.s-card, .s-item').count()
-                print(f"📊 Found {products} product listings")
-                if products == 0:
-                    print("❌ No product listings found on page")
-                    # Take a screenshot for debugging
-                    try:
-                        self.page.screenshot(path='debug_search_results.png')
-                        print("📸 Screenshot saved to debug_search_results.png")
-                    except:
-                        pass
-                    return False
-            except Exception as e:
-                print(f"⚠️  Error checking for products: {str(e)}")
-                print("⚠️  Could not find products, but continuing...")
+        Args:
+            search_term (str): The product to search for
+            page_number (int): Results page to open (default: 1)
 
-            print("✅ Search results loaded successfully\n")
-            return True
+        Returns:
+            str: Search URL with the lowest-price-first sort applied
+        """
+        from urllib.parse import urlencode
+
+        params = {
+            '_nkw': search_term,
+            '_sacat': '0',
+            '_sop': '15',  # Price + Shipping: lowest first
+        }
+        params.update(self.filter_params())
+        if page_number > 1:
+            params['_pgn'] = str(page_number)
+        return f"{self.ebay_url}/sch/i.html?{urlencode(params)}"
+
+    def filter_params(self):
+        """
+        Build the URL parameters for the configured server-side filters.
+
+        Returns:
+            dict: eBay search parameters (_ipg, LH_BIN, LH_ItemCondition, LH_PrefLoc)
+        """
+        params = {}
+        if self.items_per_page:
+            params['_ipg'] = str(self.items_per_page)
+        if self.buy_it_now:
+            params['LH_BIN'] = '1'
+        if self.conditions:
+            params['LH_ItemCondition'] = '|'.join(self.CONDITION_CODES[name] for name in self.conditions)
+        if self.location:
+            params['LH_PrefLoc'] = self.LOCATION_CODES[self.location]
+        return params
+
+    @timed('search')
+    def search_sorted(self, search_term):
+        """
+        Search for a product by navigating directly to the price-sorted results.
+
+        Skips the homepage, the search box and the separate sort navigation, so the
+        sorted results are reached in a single page load.
+
+        Args:
+            search_term (str): The product to search for
+
+        Returns:
+            bool: True if search was successful, False otherwise
+        """
+        try:
+            print(f"🔍 Searching eBay {self.region} for: \"{search_term}\" (direct sorted search)")
+
+            search_url = self.build_search_url(search_term)
+            print(f"🔗 Navigating to {search_url}...")
+            self.page.goto(search_url, timeout=30000)
+
+            # Handle cookie consent if present
+            self.handle_cookie_consent()
+
+            # Set delivery location
+            self.set_delivery_location()
+
+            if '_sop=15' in self.page.url:
+                print("✅ Results sorted by lowest price (_sop=15 confirmed)")
+            else:
+                print("⚠️  Sort parameter may not have persisted, but continuing...")
+
+            return self._verify_search_results(search_term)
 
         except PlaywrightTimeoutError:
+            self.record_timeout('search')
             print("❌ Error: Timeout while searching. eBay might be slow or unreachable.")
             return False
         except Exception as e:
             print(f"❌ Error during search: {str(e)}")
             return False
 
+    def _verify_search_results(self, search_term):
+        """
+        Check that the current page holds product listings for the search.
+
+        Args:
+            search_term (str): The product that was searched for
+
+        Returns:
+            bool: True if listings are present, False otherwise
+        """
+        # Debug: Print current URL to see where we are
+        current_url = self.page.url
+        print(f"📍 Current URL: {current_url}")
+
+        # Check if we have results
+        if self.find_visible('no_results', self.NO_RESULTS_SELECTORS, timeout=1000):
+            print(f"❌ No results found for \"{search_term}\"")
+            self.no_results_found = True
+            return False
+
+        # Verify we actually have product listings
+        try:
+            # Wait a bit for products to appear
+            print("🔍 Waiting for product listings to appear...")
+            self.page.wait_for_selector(self.LISTING_SELECTOR, timeout=10000)
+            products = self.page.locator(self.LISTING_SELECTOR).count()
+            print(f"📊 Found {products} product listings")
+            if products == 0:
+                print("❌ No product listings found on page")
+                # Take a screenshot for debugging
+                try:
+                    self.page.screenshot(path='debug_search_results.png')
+                    print("📸 Screenshot saved to debug_search_results.png")
+                except:
+                    pass
+                return False
+        except Exception as e:
+            print(f"⚠️  Error checking for products: {str(e)}")
+            print("⚠️  Could not find products, but continuing...")
+
+        print("✅ Search results loaded successfully\n")
+        return True
+
+    @timed('sort')
     def sort_by_lowest_price(self):
         """
         Sort search results by lowest price first by manipulating the URL.
@@ -325,6 +1095,10 @@ class EbayScraper:
             # Add or update the sort parameter
             params['_sop'] = ['15']  # Price + Shipping: lowest first
 
+            # Apply the server-side filters
+            for name, value in self.filter_params().items():
+                params[name] = [value]
+
             # Remove tracking parameters that might interfere
             params.pop('_trksid', None)
 
@@ -347,8 +1121,12 @@ class EbayScraper:
 
             # Wait for the page to load
             print("⏳ Waiting for sorted results to load...")
-            self.page.wait_for_load_state('networkidle', timeout=15000)
-            time.sleep(2)  # Wait to see the sorted results
+            if self.wait_profile == 'demo':
+                self.page.wait_for_load_state('networkidle', timeout=15000)
+                time.sleep(2)  # Wait to see the sorted results
+            else:
+                self.page.wait_for_url(lambda url: '_sop=15' in url, timeout=15000)
+                self.wait_until_ready(self.LISTING_SELECTOR, 0, state='attached')
 
             # Verify the sort parameter is in the final URL
             final_url = self.page.url
@@ -360,244 +1138,389 @@ class EbayScraper:
             return True
 
         except PlaywrightTimeoutError:
+            self.record_timeout('sort')
             print("❌ Error: Timeout while sorting results")
             return False
         except Exception as e:
             print(f"❌ Error during sorting: {str(e)}")
             return False
 
-    def extract_lowest_price(self, store_name=None):
+    @timed('parse')
+    def extract_listings(self, page=None):
         """
-        Extract the lowest price and optionally a specific store's price.
+        Read every result card on the current search results page in one in-page pass.
 
         Args:
-            store_name (str): Optional store name to find (e.g., 'uniquesellingmart')
+            page: Page showing search results (default: the scraper's main page)
 
         Returns:
-            dict: Dictionary containing lowest price info and optional store price, or None if extraction failed
+            list: One dict per listing with 'listing_id', 'title', 'price', 'shipping',
+                'seller', 'position', 'url' and 'match_text' (lowercased card text and links)
         """
-        try:
-            print("🎯 Locating the first product (iid:1)...")
+        listings = (page or self.page).evaluate(self.EXTRACT_LISTINGS_JS, self.LISTING_FIELD_SELECTORS)
+        return self.normalize_listings(listings)
 
-            # Find the first listing item with data-view containing iid:1
-            first_item = self.page.locator('li[data-view*="iid:1"]').first
-
-            if first_item.count() == 0:
-                print("❌ Error: Could not find first item (iid:1)")
-                return None
+    def normalize_listings(self, listings):
+        """
+        Point every extracted listing that has a listing ID at its clean product URL.
 
-            print("✅ Found first item (iid:1)")
+        Args:
+            listings (list): Listing dicts returned by EXTRACT_LISTINGS_JS
 
-            # Find the clickable link element (the <a> tag containing the title)
-            link_selectors = [
-                'a.s-card__link[href*="/itm/"]',
-                'a.s-item__link'
-            ]
+        Returns:
+            list: The same listings, updated in place
+        """
+        for listing in listings:
+            if listing['listing_id']:
+                # Construct clean URL using listing ID
+                listing['url'] = f"{self.ebay_url}/itm/{listing['listing_id']}"
 
-            clickable_link = None
-            for selector in link_selectors:
-                try:
-                    elem = first_item.locator(selector).first
-                    if elem.count() > 0:
-                        clickable_link = elem
-                        print(f"✅ Found clickable link with selector: {selector}")
-                        break
-                except Exception as e:
-                    print(f"⚠️  Selector {selector} failed: {str(e)}")
-                    continue
-
-            if not clickable_link:
-                print("❌ Error: Could not find clickable link element")
-                return None
+        return listings
 
-            # Get title text from inside the link
-            try:
-                title_elem = clickable_link.locator('.su-styled-text, .s-card__title, .s-item__title').first
-                if title_elem.count() > 0:
-                    title_text = title_elem.text_content().strip()
-                else:
-                    # Fallback to link text
-                    title_text = clickable_link.text_content().strip()[:100]  # First 100 chars
-            except:
-                title_text = "Product Title"
+    def read_price(self, page):
+        """
+        Extract the price from a loaded product page.
 
-            print(f"📝 Product title: {title_text}")
+        Args:
+            page: Page showing a product
 
-            # Extract listing ID from the parent li element's data-listingid attribute
-            listing_id = first_item.get_attribute('data-listingid')
+        Returns:
+            tuple: (cleaned price, raw price text), or (None, None) if no price was found
+        """
+        # Wait for product page to load
+        try:
+            page.wait_for_load_state('domcontentloaded', timeout=10000)
+        except:
+            self.record_timeout('product_page')
+            print("⚠️  Page loading slowly, but continuing...")
+
+        # Extra wait for dynamic content
+        self.pause(3)
+
+        # Wait for whichever price element shows up first
+        selector, price_text = self.race_visible('price', self.PRICE_SELECTORS, 3000, page=page, accept=self.clean_price)
+        if not selector:
+            return None, None
+        return self.clean_price(price_text), price_text
+
+    @timed('detail')
+    def read_product_prices(self, product_urls):
+        """
+        Read several product pages in parallel tabs, at most verify_tabs at a time.
 
-            if listing_id:
-                # Construct clean URL using listing ID
-                product_url = f"{self.ebay_url}/itm/{listing_id}"
-                print(f"📝 Listing ID: {listing_id}")
-                print(f"🔗 Product URL: {product_url}")
-            else:
-                # Fallback to href attribute
-                product_url = clickable_link.get_attribute('href')
-                print(f"🔗 Product URL (from href): {product_url}")
+        Each round starts every tab's navigation before any of them is read, so the pages
+        load in parallel; the tabs are then reused for the next round. The search results
+        page stays as it is.
 
-            print("🖱️  Navigating to product page...")
-            self.page.goto(product_url, timeout=30000)
+        Args:
+            product_urls (list): Product page URLs
 
-            # Wait for product page to load
-            print("⏳ Waiting for product page to load...")
-            try:
-                self.page.wait_for_load_state('domcontentloaded', timeout=10000)
-                print("✅ Product page loaded")
-            except:
-                print("⚠️  Page loading slowly, but continuing...")
+        Returns:
+            list: One {'price', 'price_text', 'url'} dict per URL, in the same order; 'price'
+                is None if no price was found
+        """
+        details = []
+        tabs = []
+        try:
+            for start in range(0, len(product_urls), self.verify_tabs):
+                batch = product_urls[start:start + self.verify_tabs]
+                while len(tabs) < len(batch):
+                    tabs.append(self.context.new_page())
 
-            time.sleep(3)  # Extra wait for dynamic content
+                for tab, product_url in zip(tabs, batch):
+                    print(f"🗂️  Opening product page in a tab: {product_url}")
+                    # Return as soon as navigation commits so the next tab starts loading too
+                    tab.goto(product_url, wait_until='commit', timeout=30000)
 
-            # Extract price from product page
-            print("💰 Extracting price from product page...")
+                print("💰 Extracting prices from product pages...")
+                for tab in tabs[:len(batch)]:
+                    price, price_text = self.read_price(tab)
+                    details.append({'price': price, 'price_text': price_text, 'url': tab.url})
 
-            price_selectors = [
-                '.x-bin-price__content .x-price-primary span.ux-textspans',
-                '.x-price-primary span.ux-textspans',
-                '.x-price-primary span',
-                '#prcIsum'
-            ]
+            return details
 
-            product_price = None
-            for selector in price_selectors:
+        finally:
+            for tab in tabs:
                 try:
-                    price_elem = self.page.locator(selector).first
-                    if price_elem.is_visible(timeout=3000):
-                        price_text = price_elem.text_content().strip()
-                        product_price = self.clean_price(price_text)
-                        if product_price:
-                            print(f"✅ Found price: {product_price}")
-                            break
-                except:
-                    continue
+                    tab.close()
+                except Exception:
+                    pass
 
-            if not product_price:
-                print("❌ Error: Could not extract price from product page")
-                return None
+    def extract_lowest_price(self, store_name=None, listings=None):
+        """
+        Extract the lowest price and optionally one or more stores' prices.
 
-            product_url = self.page.url
+        Prices come from the result cards or the product pages depending on the verify mode.
+        A single store name (str) is looked up and reported as 'your_store'. Every requested
+        store also gets an entry in 'stores' with its cheapest listing (card price) and its
+        rank in the sorted results.
 
-            lowest_price_info = {
-                'title': title_text,
-                'price': product_price,
-                'url': product_url
-            }
+        Args:
+            store_name (str or iterable): Optional store name, or several, to find (e.g., 'uniquesellingmart')
+            listings (list): Listings already read by another backend (default: read the
+                current page)
 
-            print(f"✅ Lowest price: {product_price} - {title_text}")
+        Returns:
+            dict: Dictionary containing lowest price info and optional store prices, or None if extraction failed
+        """
+        try:
+            if listings is None:
+                print("🎯 Reading result listings...")
+                listings = self.extract_listings()
+            print(f"📊 Read {len(listings)} listings in one pass")
 
-            result = {
-                'lowest': lowest_price_info
-            }
+            if not listings:
+                print("❌ Error: Could not find any listings with a product link")
+                return None
 
-            # If store name provided, go back and find that store's listing
-            if store_name:
-                print(f"\n🔙 Going back to search results...")
-                self.page.go_back()
-                self.page.wait_for_load_state('networkidle', timeout=15000)
-                time.sleep(2)
-
-                print(f"🏪 Looking for store: {store_name}...")
-
-                # Find all listing items
-                all_items = self.page.locator('li.s-card, li.s-item')
-
-                # Search through items for the store
-                for i in range(min(all_items.count(), 50)):
-                    try:
-                        item = all_items.nth(i)
-                        item_html = item.inner_html()
-
-                        # Check if this listing is from the target store
-                        if store_name.lower() in item_html.lower():
-                            print(f"✅ Found {store_name} listing at position {i + 1}")
-
-                            # Find and click the link (not just the title)
-                            store_link = None
-                            for link_selector in ['a.s-card__link[href*="/itm/"]', 'a.s-item__link']:
-                                try:
-                                    elem = item.locator(link_selector).first
-                                    if elem.count() > 0:
-                                        store_link = elem
-                                        break
-                                except:
-                                    continue
-
-                            if store_link and store_link.count() > 0:
-                                # Get title
-                                try:
-                                    title_elem = store_link.locator('.su-styled-text, .s-card__title, .s-item__title').first
-                                    if title_elem.count() > 0:
-                                        store_title = title_elem.text_content().strip()
-                                    else:
-                                        store_title = store_link.text_content().strip()[:100]
-                                except:
-                                    store_title = "Store Product"
-
-                                print(f"📝 Store product: {store_title}")
-
-                                # Extract listing ID from the parent li element's data-listingid attribute
-                                store_listing_id = item.get_attribute('data-listingid')
-
-                                if store_listing_id:
-                                    # Construct clean URL using listing ID
-                                    store_url = f"{self.ebay_url}/itm/{store_listing_id}"
-                                    print(f"📝 Store Listing ID: {store_listing_id}")
-                                    print(f"🔗 Store product URL: {store_url}")
-                                else:
-                                    # Fallback to href attribute
-                                    store_url = store_link.get_attribute('href')
-                                    print(f"🔗 Store product URL (from href): {store_url}")
-
-                                print("🖱️  Navigating to store product page...")
-                                self.page.goto(store_url, timeout=30000)
-
-                                try:
-                                    self.page.wait_for_load_state('domcontentloaded', timeout=10000)
-                                    print("✅ Store product page loaded")
-                                except:
-                                    print("⚠️  Page loading slowly, but continuing...")
-
-                                time.sleep(3)
-
-                                # Extract price from store's product page
-                                store_price = None
-                                for selector in price_selectors:
-                                    try:
-                                        price_elem = self.page.locator(selector).first
-                                        if price_elem.is_visible(timeout=3000):
-                                            price_text = price_elem.text_content().strip()
-                                            store_price = self.clean_price(price_text)
-                                            if store_price:
-                                                print(f"✅ Store price: {store_price}")
-                                                break
-                                    except:
-                                        continue
-
-                                if store_price:
-                                    result['your_store'] = {
-                                        'title': store_title,
-                                        'price': store_price,
-                                        'url': self.page.url
-                                    }
-                                break
-                    except Exception as e:
-                        print(f"⚠️  Error checking item {i}: {str(e)}")
-                        continue
-
-                if 'your_store' not in result:
-                    print(f"⚠️  Could not find listing from store: {store_name}")
-
-            print("\n✅ Successfully extracted price information\n")
-            return result
+            plan = self.plan_price_check(listings, store_name)
+            details = []
+            if plan['detail_urls']:
+                # Confirm the cheapest candidates (and the store's listing) on their product
+                # pages, fetched side by side in separate tabs
+                details = self.read_product_prices(plan['detail_urls'])
+            return self.build_price_result(plan, details)
 
         except PlaywrightTimeoutError:
+            self.record_timeout('extract')
             print("❌ Error: Timeout while extracting prices")
             return None
         except Exception as e:
             print(f"❌ Error during price extraction: {str(e)}")
             return None
 
+    def plan_price_check(self, listings, store_name=None):
+        """
+        Work out from the result cards which product pages a price check has to read.
+
+        Shared by every engine: only reading the product pages differs between them, and
+        build_price_result() turns the plan and what was read into the result.
+
+        Args:
+            listings (list): Listings read from the results page (not empty)
+            store_name (str or iterable): Optional store name, or several, to find
+
+        Returns:
+            dict: 'ordered' listings, 'store_names', 'stores' found, the single store's
+                'store_listing', the 'candidates' to verify and the 'detail_urls' to read
+        """
+        # The first listing (iid:1) is the lowest priced one
+        ordered = sorted(listings, key=lambda listing: listing['position'])
+        first = ordered[0]
+        print(f"✅ Found first item (iid:{first['position']})")
+        print(f"📝 Product title: {first['title']}")
+        print(f"🔗 Product URL: {first['url']}")
+
+        # If store names provided, find them all in one pass over the cards already read
+        store_names = self.store_names(store_name)
+        stores = {}
+        if store_names:
+            print(f"🏪 Looking for {len(store_names)} store(s): {', '.join(store_names)}...")
+            # Built like every other result entry, plus the listing's rank in the sorted results
+            for name, listing in StoreMatcher(store_names).match(listings).items():
+                stores[name] = self.listing_info(
+                    listing, self.clean_price(listing['price']), listing['url'], 'card', listing['price']
+                )
+                stores[name]['rank'] = listing['position']
+
+            for name in store_names:
+                if name in stores:
+                    print(f"✅ Found {name} listing at position {stores[name]['rank']}")
+                else:
+                    print(f"⚠️  Could not find listing from store: {name}")
+
+        # A single store is reported as 'your_store'
+        store_listing = None
+        if isinstance(store_name, str) and store_names and store_names[0] in stores:
+            store_listing = stores[store_names[0]]
+            print(f"📝 Store product: {store_listing['title']}")
+
+        candidates = self.verify_candidates(ordered)
+        detail_urls = []
+        if candidates:
+            print(f"🔎 Verifying {len(candidates)} candidate(s) on product pages ({self.verify})...")
+            detail_urls = [listing['url'] for listing in candidates]
+            if store_listing:
+                detail_urls.append(store_listing['url'])
+
+        return {
+            'ordered': ordered,
+            'store_names': store_names,
+            'stores': stores,
+            'store_listing': store_listing,
+            'candidates': candidates,
+            'detail_urls': detail_urls,
+        }
+
+    def build_price_result(self, plan, details):
+        """
+        Build the scrape result from a price check plan and the product pages it read.
+
+        Args:
+            plan (dict): Plan from plan_price_check()
+            details (list): One {'price', 'price_text', 'url'} dict per plan['detail_urls'],
+                in the same order
+
+        Returns:
+            dict: Lowest price info and optional store prices, or None if no price was found
+        """
+        candidates = plan['candidates']
+        store_listing = plan['store_listing']
+        if candidates:
+            lowest_price_info = self.choose_verified(candidates, details[:len(candidates)])
+            if not lowest_price_info:
+                print("❌ Error: Could not extract price from product page")
+                return None
+
+            store_detail = details[len(candidates)] if store_listing else None
+        else:
+            # Take the price straight from the sorted results card
+            first = plan['ordered'][0]
+            lowest_price_info = self.listing_info(
+                first, self.clean_price(first['price']), first['url'], 'card', first['price']
+            )
+            if not lowest_price_info['price']:
+                print("❌ Error: Could not read price from the result card")
+                return None
+
+            store_detail = None
+            if store_listing:
+                store_detail = store_listing
+
+        print(f"✅ Lowest price: {lowest_price_info['price']} - {lowest_price_info['title']}")
+
+        result = {
+            'lowest': lowest_price_info
+        }
+        if plan['store_names']:
+            result['stores'] = plan['stores']
+
+        if store_detail and store_detail['price']:
+            print(f"✅ Store price: {store_detail['price']}")
+            result['your_store'] = self.listing_info(
+                store_listing,
+                store_detail['price'],
+                store_detail['url'],
+                'product_page' if candidates else 'card',
+                store_detail.get('price_text')
+            )
+            result['your_store']['store'] = plan['store_names'][0]
+
+        print("\n✅ Successfully extracted price information\n")
+        return result
+
+    def verify_candidates(self, ordered_listings):
+        """
+        Pick the listings whose price should be confirmed on the product page.
+
+        Args:
+            ordered_listings (list): Listings in price-sorted order
+
+        Returns:
+            list: No listings for verify='none', the first for 'top1', the first K for 'topK'
+        """
+        if self.verify == 'none':
+            return []
+        if self.verify == 'top1':
+            return ordered_listings[:1]
+        return ordered_listings[:self.verify_k]
+
+    def is_price_range(self, price_text):
+        """
+        Check whether a displayed price is a range, as shown for listings with variations.
+
+        Args:
+            price_text (str): Raw price text
+
+        Returns:
+            bool: True for texts like '£5.00 to £20.00'
+        """
+        return bool(price_text) and bool(self.PRICE_RANGE_PATTERN.search(price_text))
+
+    def choose_verified(self, candidates, details):
+        """
+        Pick the cheapest candidate by its product-page price.
+
+        With more than one candidate, listings whose card or product page shows a price range
+        (variations) are skipped, since their lowest variation is often not the product searched
+        for. If every candidate is a range, the cheapest one is still returned.
+
+        Args:
+            candidates (list): Listings that were verified, in price-sorted order
+            details (list): {'price', 'price_text', 'url'} from the product page of each candidate
+
+        Returns:
+            dict: Listing info of the cheapest verified candidate, or None if none had a price
+        """
+        priced = [(listing, detail) for listing, detail in zip(candidates, details) if detail['price']]
+        fixed = [
+            (listing, detail) for listing, detail in priced
+            if not self.is_price_range(listing['price']) and not self.is_price_range(detail.get('price_text'))
+        ]
+        if len(candidates) > 1 and fixed:
+            skipped = len(priced) - len(fixed)
+            if skipped:
+                print(f"⚠️  Skipping {skipped} candidate(s) priced as a range of variations")
+            priced = fixed
+
+        best = None
+        best_value = None
+        for listing, detail in priced:
+            # Compare the raw text: clean_price() keeps only the display form, which loses
+            # continental formats like '1.234,50 EUR'
+            value, _currency = parse_price(detail.get('price_text'), self.region)
+            if value is None:
+                value, _currency = parse_price(detail['price'], self.region)
+            if value is None:
+                # Unparseable, but confirmed: rank it last rather than dropping it
+                value = float('inf')
+            # Ties keep the earlier (better sorted) listing
+            if best is None or value < best_value:
+                best = self.listing_info(listing, detail['price'], detail['url'], 'product_page', detail.get('price_text'))
+                best_value = value
+
+        return best
+
+    def listing_info(self, listing, price, url, source, price_text=None):
+        """
+        Build the result entry for a listing.
+
+        Args:
+            listing (dict): Extracted listing (or store match)
+            price (str): Cleaned price
+            url (str): Product URL
+            source (str): 'card' if the price came from the results card, 'product_page' otherwise
+            price_text (str): Price as displayed on the card or product page (default: None)
+
+        Returns:
+            dict: Title, price, displayed price text, URL, listing ID, seller and price source
+        """
+        return {
+            'title': listing['title'],
+            'price': price,
+            'price_text': price_text,
+            'url': url,
+            'listing_id': listing['listing_id'],
+            'seller': listing['seller'],
+            'source': source
+        }
+
+    def store_names(self, store_name):
+        """
+        Normalize the store_name argument to a list of names.
+
+        Args:
+            store_name (str or iterable): A store name, several store names, or None
+
+        Returns:
+            list: Store names, without blanks
+        """
+        if not store_name:
+            return []
+        if isinstance(store_name, str):
+            store_name = [store_name]
+        return [name.strip() for name in store_name if name and name.strip()]
+
     def clean_price(self, price_text):
         """
         Clean and format the price text.
@@ -628,40 +1551,267 @@ class EbayScraper:
 
         return None
 
-    def scrape(self, search_term, store_name=None):
+    def cache_mode(self):
+        """
+        Describe the options that change what a scrape returns, for use in cache keys.
+
+        Returns:
+            str: Mode string
+        """
+        search = 'direct' if self.direct_search else 'homepage'
+        verify = f'top{self.verify_k}' if self.verify == 'topK' else self.verify
+        filters = '&'.join(f'{name}={value}' for name, value in sorted(self.filter_params().items()))
+        mode = f'{search}/{verify}/{filters}'
+        if self.base_url:
+            # Results from a stand-in site must never be served for the real one
+            mode = f'{urlparse(self.ebay_url).netloc}/{mode}'
+        return mode
+
+    def open_session(self, search_term=None):
+        """
+        Get a page to work with: borrow a warm context from the pool, or start a browser.
+
+        Args:
+            search_term (str): The product about to be searched, for HAR file names (default: None)
+        """
+        if self.pool:
+            # Borrow a warm context from the pool
+            with self.timer.span('context'):
+                self.context, self.page = self.pool.acquire(self)
+        else:
+            # Start the browser
+            self.start(search_term)
+
+    def close_session(self, healthy=True):
+        """
+        Give back what open_session() took.
+
+        Args:
+            healthy (bool): False if the session failed and a pooled context should be discarded
+        """
+        if self.pool:
+            # Hand the context back so the next scrape can reuse it
+            self.pool.release(self, healthy=healthy)
+        else:
+            # Always close the browser
+            self.close()
+            self.browser = None
+            self.playwright = None
+        self.context = None
+        self.page = None
+
+    def iter_listings(self, search_term, max_pages=5, stop=None):
+        """
+        Walk the price-sorted result pages and yield listings as each page is parsed.
+
+        While the caller works through page N, page N+1 is already loading in a second tab.
+        Opens its own browser session (or borrows one from the pool) unless the scraper has
+        one already.
+
+        Args:
+            search_term (str): The product to search for
+            max_pages (int): Maximum number of result pages to read (default: 5)
+            stop (callable): Optional predicate called with each listing; iteration ends
+                after the first listing for which it returns True
+
+        Yields:
+            dict: Listing as returned by extract_listings(), plus 'page' (result page number)
+                and 'rank' (position across all pages read so far)
+        """
+        owns_session = self.page is None
+        healthy = True
+        prefetch_tab = None
+        if owns_session:
+            self.open_session(search_term)
+
+        try:
+            print(f"🔍 Reading up to {max_pages} result page(s) for \"{search_term}\"...")
+            self.page.goto(self.build_search_url(search_term), timeout=30000)
+            self.handle_cookie_consent()
+            current_tab = self.page
+
+            seen = set()
+            rank = 0
+            for page_number in range(1, max_pages + 1):
+                try:
+                    current_tab.wait_for_selector(self.LISTING_SELECTOR, state='attached', timeout=10000)
+                except PlaywrightTimeoutError:
+                    print(f"⚠️  No listings on page {page_number}, stopping")
+                    return
+
+                listings = self.extract_listings(current_tab)
+
+                # eBay serves the last page again past the end of the results
+                new_listings = [
+                    listing for listing in listings
+                    if (listing['listing_id'] or listing['url']) not in seen
+                ]
+                if not new_listings:
+                    return
+                print(f"📄 Page {page_number}: {len(new_listings)} listings")
+
+                # Start loading the next page before handing this one to the caller
+                if page_number < max_pages:
+                    if prefetch_tab is None:
+                        prefetch_tab = self.context.new_page()
+                    next_tab = prefetch_tab if current_tab is self.page else self.page
+                    next_tab.goto(
+                        self.build_search_url(search_term, page_number + 1),
+                        wait_until='commit',
+                        timeout=30000
+                    )
+                else:
+                    next_tab = None
+
+                for listing in new_listings:
+                    seen.add(listing['listing_id'] or listing['url'])
+                    rank += 1
+                    listing['page'] = page_number
+                    listing['rank'] = rank
+                    yield listing
+                    if stop and stop(listing):
+                        return
+
+                current_tab = next_tab
+
+        except Exception:
+            healthy = False
+            raise
+
+        finally:
+            if prefetch_tab is not None:
+                try:
+                    prefetch_tab.close()
+                except Exception:
+                    pass
+            if owns_session:
+                self.close_session(healthy=healthy)
+
+    def scrape(self, search_term, store_name=None, use_cache=True):
         """
         Main scraping method that orchestrates the entire process.
 
         Args:
             search_term (str): The product to search for
-            store_name (str): Optional store name to find your listing
+            store_name (str or iterable): Optional store name, or several, to find your listings
+            use_cache (bool): Return a cached result if one is fresh; False always scrapes and
+                refreshes the cache entry (default: True)
 
         Returns:
-            dict: Product information or None if scraping failed
+            dict: Product information or None if scraping failed; results carry the phase
+                timings of the scrape under 'timings'
         """
+        self.timer.reset()
+        cache_key = None
+        if self.cache:
+            # A single store gets verified as 'your_store', several don't, so keep them apart
+            mode = self.cache_mode() + (':your_store' if isinstance(store_name, str) else '')
+            cache_key = ResultCache.make_key(self.region, search_term, self.store_names(store_name), mode)
+
+            if use_cache:
+                with self.timer.span('cache'):
+                    cached = self.cache.get(cache_key)
+                if cached is not None:
+                    print(f"📦 Using cached result for \"{search_term}\" ({self.region})\n")
+                    self.finish_scrape(search_term, cached, 'cached')
+                    return cached
+
+        healthy = True
+        result = None
+        outcome = 'no_results'
+        self.no_results_found = False
         try:
-            # Start the browser
-            self.start()
+            # HAR runs go through the browser so every request is recorded or replayed
+            listings = self.fetch_listings(search_term) if self.http_backend and not self.har_mode else None
 
-            # Search for the product
-            if not self.search_product(search_term):
-                return None
+            if listings is None:
+                self.open_session(search_term)
 
-            # Sort results by lowest price
-            if not self.sort_by_lowest_price():
-                print("⚠️  Sorting failed, but continuing with unsorted results...")
+                if self.direct_search:
+                    # Land on the price-sorted results in a single navigation
+                    searched = self.search_sorted(search_term)
+                else:
+                    # Search for the product
+                    searched = self.search_product(search_term)
+
+                if not searched:
+                    # Only eBay's no-results banner counts as 'no_results'; timeouts, a missing
+                    # search box or a failed navigation are search failures
+                    outcome = 'no_results' if self.no_results_found else 'search_failed'
+                    return None
+
+                if not self.direct_search:
+                    # Sort results by lowest price
+                    if not self.sort_by_lowest_price():
+                        print("⚠️  Sorting failed, but continuing with unsorted results...")
+            elif not listings:
+                print(f"❌ No results found for \"{search_term}\"")
+                return None
+            elif self.verify != 'none':
+                # The results came over HTTP; product pages still need the browser
+                self.open_session(search_term)
 
             # Extract the lowest price and optionally the store's price
-            result = self.extract_lowest_price(store_name=store_name)
+            result = self.extract_lowest_price(store_name=store_name, listings=listings)
+            outcome = 'ok' if result else 'not_found'
+
+            if cache_key and result:
+                self.cache.set(cache_key, result)
+            if self.history and result:
+                # Queued for the history's background writer, so this doesn't block
+                self.history.record_result(self.region, search_term, result)
 
             # Wait a bit before closing so user can see the final result
-            time.sleep(3)
+            self.pause(3)
 
             return result
 
+        except Exception:
+            healthy = False
+            outcome = 'error'
+            raise
+
         finally:
-            # Always close the browser
-            self.close()
+            self.close_session(healthy=healthy)
+            self.finish_scrape(search_term, result, outcome)
+
+    def fetch_listings(self, search_term):
+        """
+        Read the first page of price-sorted results through the HTTP backend.
+
+        Args:
+            search_term (str): The product to search for
+
+        Returns:
+            list: Listings (empty if eBay has no results), or None if the browser has to
+                take over
+        """
+        try:
+            return self.http_backend.search(self, search_term)
+        except ChallengeDetected as e:
+            print(f"⚠️  HTTP backend fell back to the browser: {str(e)}")
+            return None
+
+    def finish_scrape(self, search_term, result, outcome):
+        """
+        Attach the scrape's phase timings to its result and report them to the timing log
+        and the metrics.
+
+        Args:
+            search_term (str): The product searched for
+            result (dict): Scrape result, or None if the scrape failed
+            outcome (str): 'ok', 'cached', 'no_results', 'search_failed', 'not_found' or 'error'
+        """
+        if result is not None:
+            result['timings'] = self.timer.as_dict()
+        if self.timing_log:
+            self.timing_log.write(self.region, search_term, self.timer, ok=result is not None)
+        if self.metrics:
+            self.metrics.record_scrape(self.region, outcome, self.timer)
+        if self.selector_stats:
+            self.selector_stats.save()
+        if self.selector_order:
+            self.selector_order.save()
 
 
 def main():
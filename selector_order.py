@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Adaptive selector ordering for the eBay Price Scraper
+Learns which selector candidate matches in each region and tries it first next time.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+
+
+# Default on-disk location, next to the saved cookies
+DEFAULT_ORDER_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'browser_data', 'selector_order.json'
+)
+
+
+class SelectorOrder:
+    """Persisted per-region hit table that puts the most likely selector candidate first."""
+
+    def __init__(self, path=None, epsilon=0.05, decay=0.8, seed=None):
+        """
+        Initialize the table.
+
+        Args:
+            path (str): Optional JSON file the table is loaded from and saved to; use
+                DEFAULT_ORDER_FILE to keep it next to browser_data/ (default: None, memory only)
+            epsilon (float): Chance of trying a random other candidate first, so a fallback
+                that starts winning is noticed (default: 0.05)
+            decay (float): Weight kept by older results each time a candidate is tried; lower
+                values forget faster after a layout change (default: 0.8)
+            seed (int): Seed for the exploration choices (default: None)
+        """
+        self.path = path
+        self.epsilon = epsilon
+        self.decay = decay
+        self.random = random.Random(seed)
+        self.table = {}
+        self.lock = threading.Lock()
+
+        if self.path:
+            self.load()
+
+    def order(self, region, step, selectors):
+        """
+        Order selector candidates for a try: last winner first, then by recent hit rate.
+
+        Candidates with no history keep their place relative to each other, after the ones
+        that have won.
+
+        Args:
+            region (str): eBay region searched
+            step (str): Selector list, e.g. 'search_box'
+            selectors (list): Candidates in their default order
+
+        Returns:
+            list: The same candidates, reordered
+        """
+        with self.lock:
+            entry = self.table.get(region, {}).get(step)
+            if not entry:
+                return list(selectors)
+            scores = entry['scores']
+            winner = entry.get('winner')
+            ordered = sorted(
+                selectors,
+                key=lambda selector: (
+                    selector != winner,
+                    -scores.get(selector, 0.0),
+                    selectors.index(selector),
+                )
+            )
+
+            if len(ordered) > 1 and self.random.random() < self.epsilon:
+                # Explore: give one of the others the first try
+                explored = ordered.pop(self.random.randrange(1, len(ordered)))
+                ordered.insert(0, explored)
+            return ordered
+
+    def record(self, region, step, selector, won):
+        """
+        Update the table after trying a candidate.
+
+        Args:
+            region (str): eBay region searched
+            step (str): Selector list, e.g. 'search_box'
+            selector (str): The candidate tried
+            won (bool): Whether it matched
+        """
+        with self.lock:
+            entry = self.table.setdefault(region, {}).setdefault(step, {'winner': None, 'scores': {}})
+            scores = entry['scores']
+            scores[selector] = round(scores.get(selector, 0.0) * self.decay + (1 - self.decay) * won, 6)
+            if won:
+                entry['winner'] = selector
+                entry['won_at'] = time.time()
+
+    def load(self):
+        """Load the table from its file."""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.table = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not load selector order: {str(e)}")
+
+    def save(self):
+        """Write the table to its file."""
+        if not self.path:
+            return
+
+        with self.lock:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.table, f, ensure_ascii=False, indent=1)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                print(f"⚠️  Could not save selector order: {str(e)}")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Selector statistics for the eBay Price Scraper
+Records how long each selector candidate takes to win or fail, per region, and reports
+the fallbacks that never match.
+"""
+
+import json
+import os
+import sys
+import threading
+
+
+# Default on-disk location, next to the saved cookies
+DEFAULT_STATS_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'browser_data', 'selector_stats.json'
+)
+
+
+class SelectorStats:
+    """Per-region tries, wins and wasted wall time of every selector candidate."""
+
+    def __init__(self, path=None):
+        """
+        Initialize the stats.
+
+        Args:
+            path (str): Optional JSON file the stats are loaded from and saved to, so they add
+                up across runs; use DEFAULT_STATS_FILE to keep it next to browser_data/
+                (default: None, memory only)
+        """
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+
+        if self.path:
+            self.load()
+
+    def record(self, region, step, selector, elapsed, won):
+        """
+        Record one try of a selector candidate.
+
+        Args:
+            region (str): eBay region searched
+            step (str): Selector list the candidate belongs to, e.g. 'price'
+            selector (str): The candidate
+            elapsed (float): Seconds the try took
+            won (bool): Whether the candidate matched
+        """
+        with self.lock:
+            entry = self.entries.setdefault(region, {}).setdefault(step, {}).setdefault(
+                selector, {'tries': 0, 'wins': 0, 'wasted_s': 0.0, 'win_s': 0.0}
+            )
+            entry['tries'] += 1
+            if won:
+                entry['wins'] += 1
+                entry['win_s'] += elapsed
+            else:
+                entry['wasted_s'] += elapsed
+
+    def report(self, region=None):
+        """
+        Summarize every candidate, most wasted time first within each step.
+
+        Args:
+            region (str): Only report this region (default: every region)
+
+        Returns:
+            list: One dict per candidate with 'region', 'step', 'selector', 'tries', 'wins',
+                'wasted_s', 'avg_wasted_s' and 'dead' (tried but never matched while another
+                candidate of the step did)
+        """
+        rows = []
+        with self.lock:
+            for region_name, steps in sorted(self.entries.items()):
+                if region and region_name != region:
+                    continue
+                for step, selectors in sorted(steps.items()):
+                    step_won = any(entry['wins'] for entry in selectors.values())
+                    for selector, entry in sorted(selectors.items(), key=lambda item: -item[1]['wasted_s']):
+                        failures = entry['tries'] - entry['wins']
+                        rows.append({
+                            'region': region_name,
+                            'step': step,
+                            'selector': selector,
+                            'tries': entry['tries'],
+                            'wins': entry['wins'],
+                            'wasted_s': round(entry['wasted_s'], 3),
+                            'avg_wasted_s': round(entry['wasted_s'] / failures, 3) if failures else 0.0,
+                            'dead': step_won and entry['wins'] == 0,
+                        })
+        return rows
+
+    def print_report(self, region=None):
+        """
+        Print the report as a table, flagging fallbacks that never win.
+
+        Args:
+            region (str): Only report this region (default: every region)
+        """
+        rows = self.report(region)
+        if not rows:
+            print("No selector statistics recorded yet")
+            return
+
+        print(f"{'REGION':<7}{'STEP':<16}{'TRIES':>7}{'WINS':>7}{'WASTED S':>11}{'AVG S':>8}  SELECTOR")
+        for row in rows:
+            flag = '  ⚠️  never wins' if row['dead'] else ''
+            print(f"{row['region']:<7}{row['step']:<16}{row['tries']:>7}{row['wins']:>7}"
+                  f"{row['wasted_s']:>11.2f}{row['avg_wasted_s']:>8.2f}  {row['selector']}{flag}")
+
+        dead = [row for row in rows if row['dead']]
+        if dead:
+            wasted = sum(row['wasted_s'] for row in dead)
+            print(f"\n⚠️  {len(dead)} fallback(s) never won and cost {wasted:.2f} s in total")
+
+    def load(self):
+        """Load saved stats from the stats file."""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not load selector stats: {str(e)}")
+
+    def save(self):
+        """Write the stats to the stats file."""
+        if not self.path:
+            return
+
+        with self.lock:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.entries, f, ensure_ascii=False, indent=1)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                print(f"⚠️  Could not save selector stats: {str(e)}")
+
+
+def main():
+    """Print the report for a saved stats file: selector_stats.py [stats.json] [region]."""
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_STATS_FILE
+    region = sys.argv[2].upper() if len(sys.argv) > 2 else None
+    if not os.path.exists(path):
+        print(f"❌ Error: Stats file not found: {path}")
+        sys.exit(1)
+    SelectorStats(path).print_report(region)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Phase timing for the eBay Price Scraper
+Records how long each phase of a scrape takes, so slow runs can be broken down.
+"""
+
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Phases recorded by EbayScraper, in the order a scrape runs them
+PHASES = (
+    'cache', 'launch', 'context', 'search', 'cookie_consent', 'location',
+    'sort', 'parse', 'detail', 'save_state',
+)
+
+
+class PhaseTimer:
+    """
+    Collects timed spans for the phases of one scrape.
+
+    Spans may nest (a search that handles the cookie banner): each span's 'duration_s' is
+    its wall time and 'self_s' excludes the spans inside it, so phase totals add up to the
+    time actually spent.
+    """
+
+    def __init__(self):
+        """Initialize an empty timer; the clock starts now."""
+        self.reset()
+
+    def reset(self):
+        """Drop every recorded span and restart the clock."""
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.spans = []
+        self.open_spans = []
+
+    @contextmanager
+    def span(self, phase):
+        """
+        Time the enclosed block as one span of a phase.
+
+        Args:
+            phase (str): Phase name, e.g. 'search' (see PHASES)
+        """
+        start = time.perf_counter()
+        ok = True
+        # Time spent in spans opened inside this one
+        self.open_spans.append(0.0)
+        try:
+            yield
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            nested = self.open_spans.pop()
+            if self.open_spans:
+                self.open_spans[-1] += duration
+            self.spans.append({
+                'phase': phase,
+                'start_s': round(start - self.started, 4),
+                'duration_s': round(duration, 4),
+                'self_s': round(duration - nested, 4),
+                'ok': ok,
+            })
+
+    def phase_totals(self):
+        """
+        Sum the spans of each phase, excluding time spent in nested spans.
+
+        Returns:
+            dict: Seconds per phase, in the order the phases first finished
+        """
+        totals = {}
+        for span in self.spans:
+            totals[span['phase']] = round(totals.get(span['phase'], 0) + span['self_s'], 4)
+        return totals
+
+    def as_dict(self):
+        """
+        Summarize the timer for a result record.
+
+        Returns:
+            dict: 'total_s' since the clock started, 'phases' totals and the raw 'spans'
+        """
+        return {
+            'total_s': round(time.perf_counter() - self.started, 4),
+            'phases': self.phase_totals(),
+            'spans': list(self.spans),
+        }
+
+
+def timed(phase):
+    """
+    Decorator that records every call of a scraper method as a span of the given phase.
+
+    The method's object must have a PhaseTimer in its 'timer' attribute.
+
+    Args:
+        phase (str): Phase name (see PHASES)
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.timer.span(phase):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TimingLog:
+    """Appends one JSON line of timings per scrape to a file."""
+
+    def __init__(self, path):
+        """
+        Initialize the log.
+
+        Args:
+            path (str): JSONL file to append to
+        """
+        self.path = path
+        self.lock = threading.Lock()
+
+    def write(self, region, search_term, timer, ok):
+        """
+        Append the timings of one scrape.
+
+        Args:
+            region (str): eBay region searched
+            search_term (str): The product searched for
+            timer (PhaseTimer): Timer holding the scrape's spans
+            ok (bool): Whether the scrape returned a result
+        """
+        record = {
+            'started_at': round(timer.started_at, 3),
+            'region': region,
+            'term': search_term,
+            'ok': ok,
+        }
+        record.update(timer.as_dict())
+
+        with self.lock:
+            try:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            except OSError as e:
+                print(f"⚠️  Could not write timings: {str(e)}")